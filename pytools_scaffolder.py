@@ -10,7 +10,17 @@ from tkinter import ttk, filedialog, messagebox
 import os
 import re
 import json
-from pathlib import Path
+import functools
+import shlex
+try:
+    # 可选：Rust 实现的 pathlib 替代品，扫描大目录时更快；
+    # 只有提供本工具用到的 pathlib.Path 接口时才使用，否则回退到标准库
+    from pathlibrs import Path
+    if not all(hasattr(Path, name) for name in ('home', 'exists', 'is_dir', 'mkdir', 'parent',
+                                                'read_text', 'write_text', '__truediv__')):
+        raise ImportError('pathlibrs.Path 缺少 pathlib 接口')
+except ImportError:
+    from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
@@ -528,6 +538,19 @@ class MetadataManager:
         return result
 
 
+# ==================== 脚本导出 ====================
+@functools.lru_cache(maxsize=8)
+def _build_bash_script(dirs: Tuple[str, ...], files: Tuple[str, ...]) -> str:
+    """根据解析出的目录/文件生成 bash 脚本（纯函数，相同结构重复导出直接命中缓存）"""
+    quote = shlex.quote
+    parts = ["#!/usr/bin/env bash\n", "# Generated by Project Scaffolder\n", "set -e\n\n"]
+    parts.extend(["mkdir -p " + quote(d) + "\n" for d in dirs])
+    if dirs and files:
+        parts.append("\n")
+    parts.extend(["touch " + quote(f) + "\n" for f in files])
+    return "".join(parts)
+
+
 # ==================== ASCII LOGO ====================
 ASCII_LOGO = """
 ╔═══════════════════════════════════════════════════╗
@@ -722,6 +745,8 @@ class ScaffolderApp:
         right.pack(side=tk.RIGHT)
         ttk.Button(right, text="[ PREVIEW ]", style='Cyber.TButton', command=self.preview_structure).pack(side=tk.LEFT,
                                                                                                           padx=5)
+        ttk.Button(right, text="[ EXPORT .SH ]", style='Cyber.TButton', command=self.export_script).pack(side=tk.LEFT,
+                                                                                                          padx=5)
         ttk.Button(right, text="[ CLEAR ]", style='Cyber.TButton', command=self.clear_structure).pack(side=tk.LEFT,
                                                                                                       padx=5)
 
@@ -1037,6 +1062,28 @@ class ScaffolderApp:
         text.config(state='disabled')
         ttk.Button(frame, text="[ CLOSE ]", style='Cyber.TButton', command=win.destroy).pack(pady=(10, 0))
 
+    def export_script(self):
+        """将当前结构导出为 create_project.sh"""
+        structure = self.structure_text.get('1.0', tk.END)
+        files, dirs, _ = self.parse_structure(structure)
+        if not files and not dirs:
+            messagebox.showwarning("[ WARNING ]", "No project structure to export")
+            return
+
+        path = filedialog.asksaveasfilename(initialdir=self.base_path.get(), initialfile="create_project.sh",
+                                            defaultextension=".sh",
+                                            filetypes=[("Shell script", "*.sh"), ("All files", "*.*")])
+        if not path:
+            return
+
+        try:
+            script = _build_bash_script(tuple(dirs), tuple(files))
+            with open(path, 'w', encoding='utf-8', newline='\n') as fh:
+                fh.write(script)
+            messagebox.showinfo("[ SUCCESS ]", f"Script exported!\n\n[*] {path}")
+        except Exception as e:
+            messagebox.showerror("[ ERROR ]", f"Export failed:\n{e}")
+
     def parse_structure(self, text):
         lines = text.split('\n')
         files = []
@@ -1050,6 +1097,15 @@ class ScaffolderApp:
 
         level_to_path = {}
 
+        # 热循环中的属性查找提前绑定到局部变量
+        files_append = files.append
+        dirs_add = dirs.add
+        dirs_update = dirs.update
+        clean_line = self._clean_line
+        calculate_level = self._calculate_level_fixed
+        is_file = self._is_file
+        root_prefix = root_dir + '/' if root_dir else None
+
         for line in lines:
             if not line.strip():
                 continue
@@ -1060,12 +1116,12 @@ class ScaffolderApp:
                 line = parts[0]
                 comment = parts[1].strip()
 
-            cleaned = self._clean_line(line)
-            if not cleaned or (root_dir and cleaned == root_dir + '/'):
+            cleaned = clean_line(line)
+            if not cleaned or (root_dir and cleaned == root_prefix):
                 level_to_path = {}
                 continue
 
-            level = self._calculate_level_fixed(line)
+            level = calculate_level(line)
             is_dir = cleaned.endswith('/')
             item_name = cleaned[:-1] if is_dir else cleaned
 
@@ -1078,8 +1134,8 @@ class ScaffolderApp:
 
             full_path = f"{parent_path}/{item_name}" if parent_path else item_name
 
-            if root_dir and full_path.startswith(root_dir + '/'):
-                full_path = full_path[len(root_dir) + 1:]
+            if root_dir and full_path.startswith(root_prefix):
+                full_path = full_path[len(root_prefix):]
             elif root_dir and full_path == root_dir:
                 continue
 
@@ -1088,23 +1144,21 @@ class ScaffolderApp:
 
             if is_dir:
                 if full_path:
-                    dirs.add(full_path)
+                    dirs_add(full_path)
                     level_to_path[level] = full_path
-                    for k in list(level_to_path.keys()):
-                        if k > level:
-                            del level_to_path[k]
+                    for k in [k for k in level_to_path if k > level]:
+                        del level_to_path[k]
             else:
-                if self._is_file(item_name):
+                if is_file(item_name):
                     if full_path:
-                        files.append(full_path)
+                        files_append(full_path)
                         parent = os.path.dirname(full_path)
                         if parent:
                             parts = parent.split('/')
-                            for i in range(1, len(parts) + 1):
-                                dirs.add('/'.join(parts[:i]))
+                            dirs_update(['/'.join(parts[:i]) for i in range(1, len(parts) + 1)])
                 else:
                     if full_path:
-                        dirs.add(full_path)
+                        dirs_add(full_path)
                         level_to_path[level] = full_path
 
         return sorted(set(files)), sorted(dirs), comments
@@ -1160,23 +1214,32 @@ class ScaffolderApp:
                              'timestamp': datetime.now().isoformat()}
             created_dirs = skipped_dirs = created_files = skipped_files = 0
 
+            # 子路径直接用字符串拼接，避免每项一次 Path 构造
+            root_str = os.fspath(project_root)
+            if not root_str.endswith(os.sep):
+                root_str += os.sep
+
             for d in dirs:
-                dp = project_root / d
-                if dp.exists():
+                dp = root_str + d
+                try:
+                    os.makedirs(dp)
+                except FileExistsError:
                     skipped_dirs += 1
                 else:
-                    dp.mkdir(parents=True, exist_ok=True)
                     created_dirs += 1
-                    created_items['dirs'].append(str(dp))
+                    created_items['dirs'].append(dp)
 
+            # O_CREAT | O_EXCL：存在性检查与创建合并为一次原子系统调用
+            create_flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
             for f in files:
-                fp = project_root / f
-                if fp.exists():
+                fp = root_str + f
+                try:
+                    os.close(os.open(fp, create_flags, 0o666))
+                except FileExistsError:
                     skipped_files += 1
                 else:
-                    fp.touch()
                     created_files += 1
-                    created_items['files'].append(str(fp))
+                    created_items['files'].append(fp)
 
             if comments:
                 old_meta = MetadataManager.load_metadata(project_root)
@@ -1188,12 +1251,14 @@ class ScaffolderApp:
                 self.operation_history.append(created_items)
                 self.undo_btn.config(state='normal')
 
-            msg = f"[+] Project created!\n\n[*] Location: {project_root}\n\n>>> CREATED:\n  📂 Dirs: {created_dirs}\n  📄 Files: {created_files}\n"
+            lines = ["[+] Project created!", "", f"[*] Location: {project_root}", "",
+                     ">>> CREATED:", f"  📂 Dirs: {created_dirs}", f"  📄 Files: {created_files}"]
             if skipped_dirs or skipped_files:
-                msg += f"\n>>> SKIPPED:\n  📂 Dirs: {skipped_dirs}\n  📄 Files: {skipped_files}\n"
+                lines.extend(["", ">>> SKIPPED:", f"  📂 Dirs: {skipped_dirs}", f"  📄 Files: {skipped_files}"])
             if comments:
-                msg += f"\n>>> METADATA:\n  💾 Comments: {len(comments)}\n"
-            messagebox.showinfo("[ SUCCESS ]", msg)
+                lines.extend(["", ">>> METADATA:", f"  💾 Comments: {len(comments)}"])
+            lines.append("")
+            messagebox.showinfo("[ SUCCESS ]", "\n".join(lines))
         except Exception as e:
             messagebox.showerror("[ ERROR ]", f"Failed:\n{e}")
 
@@ -1381,16 +1446,18 @@ class ScaffolderApp:
 
             for file_path, backup in last['files'].items():
                 try:
-                    p = Path(file_path)
                     if backup is None:
-                        if p.exists():
-                            p.unlink()
+                        try:
+                            os.unlink(file_path)
                             deleted += 1
+                        except FileNotFoundError:
+                            pass
                     else:
-                        p.write_text(backup, encoding='utf-8')
+                        with open(file_path, 'w', encoding='utf-8') as fh:
+                            fh.write(backup)
                         restored += 1
                 except Exception as e:
-                    errors.append(f"{p.name}: {e}")
+                    errors.append(f"{os.path.basename(file_path)}: {e}")
 
             self.template_history.pop()
             if not self.template_history and not self.operation_history:
@@ -1412,22 +1479,21 @@ class ScaffolderApp:
         try:
             deleted_files = deleted_dirs = 0
 
+            # 纯 os 调用：记录的已是绝对路径字符串，无需逐条构造 Path
             for fp in last['files']:
                 try:
-                    p = Path(fp)
-                    if p.exists() and p.stat().st_size == 0:
-                        p.unlink()
+                    if os.stat(fp).st_size == 0:
+                        os.unlink(fp)
                         deleted_files += 1
-                except:
+                except OSError:
                     pass
 
-            for dp in sorted(last['dirs'], key=lambda x: x.count('/'), reverse=True):
+            # rmdir 对非空目录直接失败，省去 exists + iterdir 两次检查
+            for dp in sorted(last['dirs'], key=lambda x: x.count(os.sep) + x.count('/'), reverse=True):
                 try:
-                    p = Path(dp)
-                    if p.exists() and not any(p.iterdir()):
-                        p.rmdir()
-                        deleted_dirs += 1
-                except:
+                    os.rmdir(dp)
+                    deleted_dirs += 1
+                except OSError:
                     pass
 
             if last.get('old_metadata'):
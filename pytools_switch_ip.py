@@ -1,10 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, font as tkfont
+import ctypes
+import ipaddress
+import concurrent.futures
+import codecs
 import subprocess
 import json
 import os
+import platform
 import re
 import sys
+import time
 
 
 class DarkTheme:
@@ -28,15 +34,346 @@ class DarkTheme:
     INPUT_BORDER = "#555555"
 
 
+IS_WINDOWS = platform.system() == 'Windows'
+
+
+# ==================== 配置序列化 ====================
+# 优先使用 orjson（可选依赖），否则回退到标准库 json
+try:
+    import orjson
+
+    def _dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data):
+        return json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+
+    _loads = json.loads
+
+
+# ==================== 子进程调用 ====================
+# 不经 cmd.exe 直接启动，并禁止创建控制台窗口（打包为 exe 后不再闪黑框）
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+# 未经 chcp 切换时 netsh / PowerShell 按 OEM 代码页输出
+try:
+    codecs.lookup('oem')
+    CONSOLE_ENCODING = 'oem'
+except LookupError:
+    CONSOLE_ENCODING = 'utf-8'
+
+PS_UP_ADAPTERS = "Get-NetAdapter | Where-Object {$_.Status -eq 'Up'} | Select-Object -ExpandProperty Name"
+
+
+def run_command(args, shell=False, errors='replace', text=True):
+    """执行命令并以控制台编码解码输出；text=False 时返回原始字节"""
+    if not text:
+        return subprocess.run(args, capture_output=True, shell=shell, creationflags=CREATE_NO_WINDOW)
+    return subprocess.run(args,
+                          capture_output=True,
+                          text=True,
+                          shell=shell,
+                          encoding=CONSOLE_ENCODING,
+                          errors=errors,
+                          creationflags=CREATE_NO_WINDOW)
+
+
+# 始终附加在下拉框中的常见适配器名称
+COMMON_ADAPTERS = ('以太网 2', 'LetsTAP', 'WLAN 2', 'vEthernet (Default Switch)',
+                   '以太网', '本地连接', 'WLAN', 'Wi-Fi')
+
+
+# 预编译的 netsh 输出解析正则
+_MASK_RE = re.compile(r'(?:mask|掩码)\s*(\d+\.\d+\.\d+\.\d+)', re.IGNORECASE)
+_IPV4_RE = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+# 直接在字节上匹配，只解码命中的适配器名称
+_ADAPTER_NAME_RE_B = re.compile(rb'"([^"\r\n]+)"')
+
+# netsh interface ip show config 字段名（英文 / 中文系统）
+_NETSH_IP_KEYS = ('ip address', 'ip 地址')
+_NETSH_PREFIX_KEYS = ('subnet prefix', '子网前缀')
+_NETSH_GATEWAY_KEYS = ('default gateway', '默认网关')
+_NETSH_DHCP_KEYS = ('dhcp enabled', 'dhcp 已启用')
+
+
+def parse_netsh_config(output):
+    """
+    单遍解析 netsh interface ip show config 的输出
+    按 "键: 值" 逐行拆分，无冒号的缩进行视为上一个键的续行（多个 DNS）
+    """
+    fields = {}
+    last_key = None
+    for line in output.splitlines():
+        key, sep, value = line.partition(':')
+        if sep and key.strip():
+            last_key = key.strip().lower()
+            fields[last_key] = [value.strip()]
+        elif last_key and line.strip():
+            fields[last_key].append(line.strip())
+
+    def first(keys):
+        return next((fields[k][0] for k in keys if k in fields), '')
+
+    ip_match = _IPV4_RE.search(first(_NETSH_IP_KEYS))
+    mask_match = _MASK_RE.search(first(_NETSH_PREFIX_KEYS))
+    gateway_match = _IPV4_RE.search(first(_NETSH_GATEWAY_KEYS))
+
+    dns = [addr for key, values in fields.items() if 'dns' in key
+           for value in values for addr in _IPV4_RE.findall(value)]
+
+    dhcp_value = first(_NETSH_DHCP_KEYS).lower()
+    dhcp = dhcp_value in ('yes', '是') if dhcp_value else 'dhcp' in output.lower()
+
+    return {
+        'dhcp': dhcp,
+        'ip': ip_match.group(1) if ip_match else None,
+        'mask': mask_match.group(1) if mask_match else None,
+        'gateway': gateway_match.group(1) if gateway_match else None,
+        'dns': dns
+    }
+
+
+# ==================== Win32 IP Helper API ====================
+# 直接调用 iphlpapi.GetAdaptersAddresses，省去 cmd/netsh 进程与文本解析
+
+AF_INET = 2
+GAA_FLAG_SKIP_ANYCAST = 0x0002
+GAA_FLAG_SKIP_MULTICAST = 0x0004
+GAA_FLAG_INCLUDE_GATEWAYS = 0x0080
+IP_ADAPTER_DHCP_ENABLED = 0x0004
+IF_TYPE_SOFTWARE_LOOPBACK = 24
+IF_TYPE_TUNNEL = 131
+ERROR_BUFFER_OVERFLOW = 111
+
+
+class SOCKET_ADDRESS(ctypes.Structure):
+    _fields_ = [('lpSockaddr', ctypes.c_void_p),
+                ('iSockaddrLength', ctypes.c_int)]
+
+
+class IP_ADAPTER_ADDRESS_ENTRY(ctypes.Structure):
+    """单播/DNS/网关地址链表节点的公共前缀布局"""
+
+
+IP_ADAPTER_ADDRESS_ENTRY._fields_ = [('Length', ctypes.c_uint32),
+                                     ('Flags', ctypes.c_uint32),
+                                     ('Next', ctypes.POINTER(IP_ADAPTER_ADDRESS_ENTRY)),
+                                     ('Address', SOCKET_ADDRESS)]
+
+
+class IP_ADAPTER_UNICAST_ADDRESS(ctypes.Structure):
+    pass
+
+
+IP_ADAPTER_UNICAST_ADDRESS._fields_ = [('Length', ctypes.c_uint32),
+                                       ('Flags', ctypes.c_uint32),
+                                       ('Next', ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+                                       ('Address', SOCKET_ADDRESS),
+                                       ('PrefixOrigin', ctypes.c_int),
+                                       ('SuffixOrigin', ctypes.c_int),
+                                       ('DadState', ctypes.c_int),
+                                       ('ValidLifetime', ctypes.c_uint32),
+                                       ('PreferredLifetime', ctypes.c_uint32),
+                                       ('LeaseLifetime', ctypes.c_uint32),
+                                       ('OnLinkPrefixLength', ctypes.c_uint8)]
+
+
+class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    pass
+
+
+IP_ADAPTER_ADDRESSES._fields_ = [('Length', ctypes.c_uint32),
+                                 ('IfIndex', ctypes.c_uint32),
+                                 ('Next', ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+                                 ('AdapterName', ctypes.c_char_p),
+                                 ('FirstUnicastAddress', ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+                                 ('FirstAnycastAddress', ctypes.c_void_p),
+                                 ('FirstMulticastAddress', ctypes.c_void_p),
+                                 ('FirstDnsServerAddress', ctypes.POINTER(IP_ADAPTER_ADDRESS_ENTRY)),
+                                 ('DnsSuffix', ctypes.c_wchar_p),
+                                 ('Description', ctypes.c_wchar_p),
+                                 ('FriendlyName', ctypes.c_wchar_p),
+                                 ('PhysicalAddress', ctypes.c_ubyte * 8),
+                                 ('PhysicalAddressLength', ctypes.c_uint32),
+                                 ('Flags', ctypes.c_uint32),
+                                 ('Mtu', ctypes.c_uint32),
+                                 ('IfType', ctypes.c_uint32),
+                                 ('OperStatus', ctypes.c_int),
+                                 ('Ipv6IfIndex', ctypes.c_uint32),
+                                 ('ZoneIndices', ctypes.c_uint32 * 16),
+                                 ('FirstPrefix', ctypes.c_void_p),
+                                 ('TransmitLinkSpeed', ctypes.c_uint64),
+                                 ('ReceiveLinkSpeed', ctypes.c_uint64),
+                                 ('FirstWinsServerAddress', ctypes.c_void_p),
+                                 ('FirstGatewayAddress', ctypes.POINTER(IP_ADAPTER_ADDRESS_ENTRY))]
+
+
+def _sockaddr_to_ipv4(socket_address):
+    """SOCKET_ADDRESS -> 点分十进制字符串（非 IPv4 返回 None）"""
+    if not socket_address.lpSockaddr or socket_address.iSockaddrLength < 8:
+        return None
+    raw = ctypes.string_at(socket_address.lpSockaddr, 8)
+    if int.from_bytes(raw[0:2], 'little') != AF_INET:
+        return None
+    return '.'.join(str(b) for b in raw[4:8])
+
+
+def _walk(node):
+    """遍历 ctypes 链表"""
+    while node:
+        yield node.contents
+        node = node.contents.Next
+
+
+def query_adapter_addresses():
+    """
+    通过 GetAdaptersAddresses 获取 IPv4 适配器配置
+    返回: [{'name', 'dhcp', 'ip', 'mask', 'gateway', 'dns'}]，失败时抛出 OSError
+    """
+    iphlpapi = ctypes.WinDLL('iphlpapi')
+    flags = GAA_FLAG_SKIP_ANYCAST | GAA_FLAG_SKIP_MULTICAST | GAA_FLAG_INCLUDE_GATEWAYS
+    size = ctypes.c_ulong(15 * 1024)
+
+    for _ in range(3):
+        buf = ctypes.create_string_buffer(size.value)
+        ret = iphlpapi.GetAdaptersAddresses(AF_INET, flags, None, buf, ctypes.byref(size))
+        if ret != ERROR_BUFFER_OVERFLOW:
+            break
+    if ret != 0:
+        raise OSError(ret, "GetAdaptersAddresses failed")
+
+    adapters = []
+    head = ctypes.cast(buf, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+    for adapter in _walk(head):
+        if adapter.IfType in (IF_TYPE_SOFTWARE_LOOPBACK, IF_TYPE_TUNNEL):
+            continue
+
+        ip = mask = None
+        for unicast in _walk(adapter.FirstUnicastAddress):
+            ip = _sockaddr_to_ipv4(unicast.Address)
+            if ip:
+                mask = str(ipaddress.IPv4Network((0, unicast.OnLinkPrefixLength)).netmask)
+                break
+
+        gateway = next((g for g in (_sockaddr_to_ipv4(e.Address) for e in _walk(adapter.FirstGatewayAddress))
+                        if g), None)
+        dns = [d for d in (_sockaddr_to_ipv4(e.Address) for e in _walk(adapter.FirstDnsServerAddress)) if d]
+
+        adapters.append({
+            'name': adapter.FriendlyName,
+            'dhcp': bool(adapter.Flags & IP_ADAPTER_DHCP_ENABLED),
+            'ip': ip,
+            'mask': mask,
+            'gateway': gateway,
+            'dns': dns
+        })
+
+    return adapters
+
+
 class IPSwitcher:
+    # 适配器列表缓存有效期（秒）
+    ADAPTER_CACHE_TTL = 5
+    # 下拉框默认展示 / 输入过滤后的最大条目数
+    COMBO_VISIBLE_LIMIT = 20
+    COMBO_FILTER_LIMIT = 100
+    # 手动模式下需校验的字段及其错误提示（按顺序）
+    REQUIRED_FIELD_ERRORS = (
+        ('ip', "IP地址或子网掩码格式不正确！"),
+        ('mask', "IP地址或子网掩码格式不正确！"),
+        ('gateway', "默认网关格式不正确！"),
+        ('dns1', "首选DNS格式不正确！"),
+    )
+
+    # 备用DNS添加失败时命令输出中的标记（该步失败不影响整体结果，只在提示中说明）
+    DNS2_FAILED_MARKER = 'DNS2_FAILED'
+    # 消息框尺寸 (宽, 高)
+    MESSAGE_SIZE = (350, 150)
+
+    # 主题样式表：'.' 提供公共默认值，其余只写差异项
+    _STYLE_SPECS = {
+        '.': dict(background=DarkTheme.BG_DARK,
+                  foreground=DarkTheme.FG_PRIMARY,
+                  fieldbackground=DarkTheme.INPUT_BG,
+                  bordercolor=DarkTheme.ACCENT_BORDER,
+                  darkcolor=DarkTheme.BG_DARKER,
+                  lightcolor=DarkTheme.BG_LIGHT,
+                  font=('Microsoft YaHei UI', 9)),
+        'Card.TFrame': dict(background=DarkTheme.BG_DARKER,
+                            relief='flat',
+                            borderwidth=1),
+        'TLabelframe': dict(relief='flat',
+                            borderwidth=1),
+        'TLabelframe.Label': dict(font=('Microsoft YaHei UI', 9, 'bold')),
+        'TEntry': dict(bordercolor=DarkTheme.INPUT_BORDER,
+                       lightcolor=DarkTheme.INPUT_BORDER,
+                       darkcolor=DarkTheme.INPUT_BORDER,
+                       insertcolor=DarkTheme.FG_PRIMARY),
+        'TCombobox': dict(background=DarkTheme.INPUT_BG,
+                          arrowcolor=DarkTheme.FG_PRIMARY,
+                          bordercolor=DarkTheme.INPUT_BORDER,
+                          lightcolor=DarkTheme.INPUT_BORDER,
+                          darkcolor=DarkTheme.INPUT_BORDER),
+        'Primary.TButton': dict(background=DarkTheme.ACCENT_BLUE,
+                                bordercolor=DarkTheme.ACCENT_BLUE,
+                                lightcolor=DarkTheme.ACCENT_BLUE,
+                                darkcolor=DarkTheme.ACCENT_BLUE,
+                                relief='flat',
+                                padding=(10, 5)),
+        'Secondary.TButton': dict(background=DarkTheme.BG_LIGHT,
+                                  lightcolor=DarkTheme.BG_LIGHT,
+                                  darkcolor=DarkTheme.BG_LIGHT,
+                                  relief='flat',
+                                  padding=(8, 4)),
+        'TSeparator': dict(background=DarkTheme.ACCENT_BORDER),
+    }
+
+    _STYLE_MAPS = {
+        'TCombobox': dict(fieldbackground=[('readonly', DarkTheme.INPUT_BG)],
+                          selectbackground=[('readonly', DarkTheme.INPUT_BG)],
+                          selectforeground=[('readonly', DarkTheme.FG_PRIMARY)]),
+        'Primary.TButton': dict(background=[('active', DarkTheme.ACCENT_BLUE_HOVER),
+                                            ('pressed', DarkTheme.ACCENT_BLUE_HOVER)],
+                                relief=[('pressed', 'flat')]),
+        'Secondary.TButton': dict(background=[('active', DarkTheme.BG_HOVER),
+                                              ('pressed', DarkTheme.BG_HOVER)]),
+        'TRadiobutton': dict(background=[('active', DarkTheme.BG_DARK)]),
+    }
+
     def __init__(self, root):
         self.root = root
+
+        # 非 Windows 系统直接退出，不再构建界面
+        if not IS_WINDOWS:
+            self.root.withdraw()
+            messagebox.showerror("错误", "此工具仅支持Windows系统")
+            self.root.destroy()
+            return
+
         self.root.title("网络IP配置工具")
         self.root.geometry("560x520")
         self.root.resizable(False, False)
         self.root.configure(bg=DarkTheme.BG_DARK)
 
-        # 设置窗口图标
+        # 图标与 AppUserModelID 推迟到主窗口首次绘制之后
+        self.root.after(0, self._apply_icon_and_appid)
+
+        self.config_file = "ip_config.json"
+        # (时间戳, 适配器列表, netsh ip show config 原始字节输出)
+        self._adapter_cache = None
+        self._all_adapters = []
+        # 后台执行 netsh 等耗时命令，避免阻塞 Tk 主循环
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.setup_dark_theme()
+        self._build_message_window()
+        self.load_config()
+        self.create_widgets()
+        self.refresh_adapters()
+
+    def _apply_icon_and_appid(self):
+        """设置窗口图标"""
         try:
             if getattr(sys, 'frozen', False):
                 application_path = sys._MEIPASS
@@ -47,7 +384,6 @@ class IPSwitcher:
             self.root.iconbitmap(icon_path)
 
             try:
-                import ctypes
                 myappid = 'mycompany.ipswitcher.app.1'
                 ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
             except:
@@ -55,112 +391,21 @@ class IPSwitcher:
         except Exception as e:
             print(f"加载图标失败: {e}")
 
-        self.config_file = "ip_config.json"
-        self.setup_dark_theme()
-        self.load_config()
-        self.create_widgets()
-        self.refresh_adapters()
-
     def setup_dark_theme(self):
-        """配置暗黑主题样式"""
+        """
+        配置暗黑主题样式
+        须在创建任何控件之前调用，之后再改样式会触发已有控件重绘
+        """
         style = ttk.Style()
         style.theme_use('clam')
 
-        style.configure('.',
-                        background=DarkTheme.BG_DARK,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        fieldbackground=DarkTheme.INPUT_BG,
-                        bordercolor=DarkTheme.ACCENT_BORDER,
-                        darkcolor=DarkTheme.BG_DARKER,
-                        lightcolor=DarkTheme.BG_LIGHT)
-
-        style.configure('TLabel',
-                        background=DarkTheme.BG_DARK,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        font=('Microsoft YaHei UI', 9))
-
-        style.configure('TFrame',
-                        background=DarkTheme.BG_DARK,
-                        bordercolor=DarkTheme.ACCENT_BORDER)
-
-        style.configure('Card.TFrame',
-                        background=DarkTheme.BG_DARKER,
-                        relief='flat',
-                        borderwidth=1)
-
-        style.configure('TLabelframe',
-                        background=DarkTheme.BG_DARK,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        bordercolor=DarkTheme.ACCENT_BORDER,
-                        relief='flat',
-                        borderwidth=1)
-
-        style.configure('TLabelframe.Label',
-                        background=DarkTheme.BG_DARK,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        font=('Microsoft YaHei UI', 9, 'bold'))
-
-        style.configure('TEntry',
-                        fieldbackground=DarkTheme.INPUT_BG,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        bordercolor=DarkTheme.INPUT_BORDER,
-                        lightcolor=DarkTheme.INPUT_BORDER,
-                        darkcolor=DarkTheme.INPUT_BORDER,
-                        insertcolor=DarkTheme.FG_PRIMARY)
-
-        style.configure('TCombobox',
-                        fieldbackground=DarkTheme.INPUT_BG,
-                        background=DarkTheme.INPUT_BG,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        arrowcolor=DarkTheme.FG_PRIMARY,
-                        bordercolor=DarkTheme.INPUT_BORDER,
-                        lightcolor=DarkTheme.INPUT_BORDER,
-                        darkcolor=DarkTheme.INPUT_BORDER)
-
-        style.map('TCombobox',
-                  fieldbackground=[('readonly', DarkTheme.INPUT_BG)],
-                  selectbackground=[('readonly', DarkTheme.INPUT_BG)],
-                  selectforeground=[('readonly', DarkTheme.FG_PRIMARY)])
-
-        style.configure('Primary.TButton',
-                        background=DarkTheme.ACCENT_BLUE,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        bordercolor=DarkTheme.ACCENT_BLUE,
-                        lightcolor=DarkTheme.ACCENT_BLUE,
-                        darkcolor=DarkTheme.ACCENT_BLUE,
-                        relief='flat',
-                        font=('Microsoft YaHei UI', 9),
-                        padding=(10, 5))
-
-        style.map('Primary.TButton',
-                  background=[('active', DarkTheme.ACCENT_BLUE_HOVER),
-                              ('pressed', DarkTheme.ACCENT_BLUE_HOVER)],
-                  relief=[('pressed', 'flat')])
-
-        style.configure('Secondary.TButton',
-                        background=DarkTheme.BG_LIGHT,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        bordercolor=DarkTheme.ACCENT_BORDER,
-                        lightcolor=DarkTheme.BG_LIGHT,
-                        darkcolor=DarkTheme.BG_LIGHT,
-                        relief='flat',
-                        font=('Microsoft YaHei UI', 9),
-                        padding=(8, 4))
-
-        style.map('Secondary.TButton',
-                  background=[('active', DarkTheme.BG_HOVER),
-                              ('pressed', DarkTheme.BG_HOVER)])
-
-        style.configure('TRadiobutton',
-                        background=DarkTheme.BG_DARK,
-                        foreground=DarkTheme.FG_PRIMARY,
-                        font=('Microsoft YaHei UI', 9))
-
-        style.map('TRadiobutton',
-                  background=[('active', DarkTheme.BG_DARK)])
-
-        style.configure('TSeparator',
-                        background=DarkTheme.ACCENT_BORDER)
+        # 等宽输入字体只创建一次，所有输入框共享同一个命名字体
+        self.mono_font = tkfont.Font(root=self.root, family='Consolas', size=9)
+
+        for name, options in self._STYLE_SPECS.items():
+            style.configure(name, **options)
+        for name, options in self._STYLE_MAPS.items():
+            style.map(name, **options)
 
     def create_widgets(self):
         main_frame = ttk.Frame(self.root, padding="15", style='TFrame')
@@ -186,12 +431,13 @@ class IPSwitcher:
         adapter_control_frame = ttk.Frame(adapter_frame, style='Card.TFrame')
         adapter_control_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E))
 
-        self.adapter_combo = ttk.Combobox(adapter_control_frame, width=35, font=('Consolas', 9))
+        self.adapter_combo = ttk.Combobox(adapter_control_frame, width=35, font=self.mono_font)
         self.adapter_combo.pack(side=tk.LEFT, padx=(0, 6))
         self.adapter_combo.bind('<<ComboboxSelected>>', self.on_adapter_change)
+        self.adapter_combo.bind('<KeyRelease>', self.on_adapter_filter)
 
         ttk.Button(adapter_control_frame, text="🔄 刷新",
-                   command=self.refresh_adapters,
+                   command=lambda: self.refresh_adapters(force=True),
                    style='Secondary.TButton').pack(side=tk.LEFT, padx=2)
 
         ttk.Button(adapter_control_frame, text="🔍 调试",
@@ -238,25 +484,20 @@ class IPSwitcher:
             label = ttk.Label(config_frame, text=label_text, width=10)
             label.grid(row=i, column=0, sticky=tk.W, pady=4, padx=(0, 10))
 
-            entry = ttk.Entry(config_frame, width=40, font=('Consolas', 9))
+            entry = ttk.Entry(config_frame, width=40, font=self.mono_font)
             entry.grid(row=i, column=1, sticky=(tk.W, tk.E), pady=4)
             entry.insert(0, self.config.get(key, default_value))
             self.entries[key] = entry
 
-        self.ip_entry = self.entries['ip']
-        self.mask_entry = self.entries['mask']
-        self.gateway_entry = self.entries['gateway']
-        self.dns1_entry = self.entries['dns1']
-        self.dns2_entry = self.entries['dns2']
-
         # 按钮区域 - 减少上边距
         button_frame = ttk.Frame(main_frame, style='TFrame')
         button_frame.grid(row=4, column=0, columnspan=5, pady=(8, 0))
 
-        ttk.Button(button_frame, text="✓ 应用设置",
-                   command=self.apply_settings,
-                   style='Primary.TButton',
-                   width=14).pack(side=tk.LEFT, padx=4)
+        self.apply_btn = ttk.Button(button_frame, text="✓ 应用设置",
+                                    command=self.apply_settings,
+                                    style='Primary.TButton',
+                                    width=14)
+        self.apply_btn.pack(side=tk.LEFT, padx=4)
 
         ttk.Button(button_frame, text="💾 保存配置",
                    command=self.save_config,
@@ -275,8 +516,8 @@ class IPSwitcher:
         """加载配置文件"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    self.config = _loads(f.read())
             except:
                 self.config = {}
         else:
@@ -284,58 +525,44 @@ class IPSwitcher:
 
     def save_config(self):
         """保存配置到文件"""
-        self.config = {
-            'ip': self.ip_entry.get(),
-            'mask': self.mask_entry.get(),
-            'gateway': self.gateway_entry.get(),
-            'dns1': self.dns1_entry.get(),
-            'dns2': self.dns2_entry.get(),
-            'mode': self.mode_var.get(),
-            'adapter': self.adapter_combo.get()
-        }
+        self.config = {key: entry.get() for key, entry in self.entries.items()}
+        self.config['mode'] = self.mode_var.get()
+        self.config['adapter'] = self.adapter_combo.get()
 
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            with open(self.config_file, 'wb') as f:
+                f.write(_dumps(self.config))
             self.show_custom_message("✓ 成功", "配置已成功保存！", "info")
         except Exception as e:
             self.show_custom_message("✗ 错误", f"保存配置失败: {str(e)}", "error")
 
-    def show_custom_message(self, title, message, msg_type="info"):
-        """显示自定义样式的消息框"""
+    def _build_message_window(self):
+        """预先构建消息框并隐藏，之后每次显示只更新文字与颜色"""
         msg_window = tk.Toplevel(self.root)
-        msg_window.title(title)
-        msg_window.geometry("350x150")
+        msg_window.withdraw()
         msg_window.resizable(False, False)
         msg_window.configure(bg=DarkTheme.BG_DARKER)
-
         msg_window.transient(self.root)
-        msg_window.grab_set()
+        msg_window.protocol("WM_DELETE_WINDOW", self._hide_message_window)
 
-        icon_map = {"info": "ℹ", "error": "✗", "warning": "⚠"}
-        color_map = {"info": "#4CAF50", "error": "#f44336", "warning": "#ff9800"}
+        self._msg_icon = tk.Label(msg_window,
+                                  font=('Arial', 32),
+                                  bg=DarkTheme.BG_DARKER)
+        self._msg_icon.pack(pady=(20, 10))
 
-        icon_label = tk.Label(msg_window,
-                              text=icon_map.get(msg_type, "ℹ"),
-                              font=('Arial', 32),
-                              fg=color_map.get(msg_type, "#4CAF50"),
-                              bg=DarkTheme.BG_DARKER)
-        icon_label.pack(pady=(20, 10))
-
-        msg_label = tk.Label(msg_window,
-                             text=message,
-                             font=('Microsoft YaHei UI', 10),
-                             fg=DarkTheme.FG_PRIMARY,
-                             bg=DarkTheme.BG_DARKER,
-                             wraplength=300)
-        msg_label.pack(pady=10)
+        self._msg_label = tk.Label(msg_window,
+                                   font=('Microsoft YaHei UI', 10),
+                                   fg=DarkTheme.FG_PRIMARY,
+                                   bg=DarkTheme.BG_DARKER,
+                                   wraplength=300)
+        self._msg_label.pack(pady=10)
 
         btn_frame = tk.Frame(msg_window, bg=DarkTheme.BG_DARKER)
         btn_frame.pack(pady=(10, 20))
 
         ok_btn = tk.Button(btn_frame,
                            text="确定",
-                           command=msg_window.destroy,
+                           command=self._hide_message_window,
                            bg=DarkTheme.ACCENT_BLUE,
                            fg=DarkTheme.FG_PRIMARY,
                            font=('Microsoft YaHei UI', 9),
@@ -348,83 +575,76 @@ class IPSwitcher:
                            bd=0)
         ok_btn.pack()
 
-        msg_window.update_idletasks()
-        x = (msg_window.winfo_screenwidth() // 2) - (msg_window.winfo_width() // 2)
-        y = (msg_window.winfo_screenheight() // 2) - (msg_window.winfo_height() // 2)
-        msg_window.geometry(f'+{x}+{y}')
+        self._msg_window = msg_window
+
+    def _hide_message_window(self):
+        self._msg_window.grab_release()
+        self._msg_window.withdraw()
+
+    def show_custom_message(self, title, message, msg_type="info"):
+        """显示自定义样式的消息框"""
+        icon_map = {"info": "ℹ", "error": "✗", "warning": "⚠"}
+        color_map = {"info": "#4CAF50", "error": "#f44336", "warning": "#ff9800"}
+
+        msg_window = self._msg_window
+        msg_window.title(title)
+        self._msg_icon.config(text=icon_map.get(msg_type, "ℹ"), fg=color_map.get(msg_type, "#4CAF50"))
+        self._msg_label.config(text=message)
+
+        # 隐藏状态下 winfo_width 不可靠，按固定尺寸居中
+        x = (msg_window.winfo_screenwidth() // 2) - (self.MESSAGE_SIZE[0] // 2)
+        y = (msg_window.winfo_screenheight() // 2) - (self.MESSAGE_SIZE[1] // 2)
+        msg_window.geometry(f'{self.MESSAGE_SIZE[0]}x{self.MESSAGE_SIZE[1]}+{x}+{y}')
+
+        msg_window.deiconify()
+        msg_window.lift()
+        msg_window.grab_set()
+
+    def get_adapters(self, force=False):
+        """获取网络适配器列表，短时间内重复调用直接返回缓存结果"""
+        cache = self._adapter_cache
+        if not force and cache and time.monotonic() - cache[0] < self.ADAPTER_CACHE_TTL:
+            return list(cache[1])
 
-    def get_adapters(self):
-        """获取网络适配器列表"""
         adapters = []
+        raw_config = None
         try:
-            import platform
-
-            if platform.system() != 'Windows':
-                messagebox.showerror("错误", "此工具仅支持Windows系统")
-                return []
-
-            encodings = ['utf-8', 'gbk', 'gb2312', 'cp936']
-
-            for encoding in encodings:
-                try:
-                    result = subprocess.run(
-                        'chcp 65001 & netsh interface ip show config',
-                        capture_output=True,
-                        text=True,
-                        shell=True,
-                        encoding=encoding,
-                        errors='ignore'
-                    )
-
-                    if result.returncode == 0 and result.stdout:
-                        lines = result.stdout.split('\n')
-                        for line in lines:
-                            match = re.search(r'[""]([^""]+)[""]', line)
-                            if match:
-                                adapter_name = match.group(1).strip()
-                                if adapter_name and adapter_name not in adapters:
-                                    if 'Loopback' not in adapter_name and 'Pseudo' not in adapter_name:
-                                        adapters.append(adapter_name)
-
-                        if adapters:
-                            break
-                except:
-                    continue
+            try:
+                adapters = [a['name'] for a in query_adapter_addresses() if a['name']]
+            except (OSError, AttributeError, ValueError):
+                adapters = []
 
             if not adapters:
-                for encoding in encodings:
-                    try:
-                        result = subprocess.run(
-                            'chcp 65001 & netsh interface show interface',
-                            capture_output=True,
-                            text=True,
-                            shell=True,
-                            encoding=encoding,
-                            errors='ignore'
-                        )
-
-                        if result.returncode == 0:
-                            lines = result.stdout.split('\n')
-                            for line in lines[3:]:
-                                line = line.strip()
-                                if line:
-                                    parts = line.split()
-                                    if len(parts) >= 4:
-                                        if any(word in line for word in ['已连接', 'Connected', '连接']):
-                                            adapter_name = ' '.join(parts[3:])
-                                            if adapter_name and adapter_name not in adapters:
-                                                adapters.append(adapter_name)
-
-                            if adapters:
-                                break
-                    except:
-                        continue
+                # 回退：netsh，单次调用，保留字节输出
+                result = run_command(['netsh', 'interface', 'ip', 'show', 'config'], text=False)
+
+                if result.returncode == 0 and result.stdout:
+                    for match in _ADAPTER_NAME_RE_B.finditer(result.stdout):
+                        adapter_name = match.group(1).decode(CONSOLE_ENCODING, 'replace').strip()
+                        if adapter_name and adapter_name not in adapters:
+                            if 'Loopback' not in adapter_name and 'Pseudo' not in adapter_name:
+                                adapters.append(adapter_name)
+
+                    if adapters:
+                        raw_config = result.stdout
+
+            if not adapters:
+                # 回退：PowerShell 直接输出已启用适配器名称，每行一个
+                result = run_command(['powershell', '-NoProfile', '-Command', PS_UP_ADAPTERS])
+
+                if result.returncode == 0:
+                    for line in result.stdout.splitlines():
+                        adapter_name = line.strip()
+                        if adapter_name and adapter_name not in adapters:
+                            adapters.append(adapter_name)
 
             if not adapters:
                 adapters = ['以太网', '以太网 2', '本地连接', 'WLAN', 'WLAN 2', 'Wi-Fi', 'Ethernet']
                 self.show_custom_message("⚠ 警告",
                                          "无法自动检测网络适配器。\n已加载常见适配器名称。\n请手动输入正确的适配器名称。",
                                          "warning")
+            else:
+                self._adapter_cache = (time.monotonic(), list(adapters), raw_config)
 
             return adapters
 
@@ -435,13 +655,14 @@ class IPSwitcher:
                                      "error")
             return adapters
 
-    def refresh_adapters(self):
+    def refresh_adapters(self, force=False):
         """刷新网络适配器列表"""
-        adapters = self.get_adapters()
-        common_adapters = ['以太网 2', 'LetsTAP', 'WLAN 2', 'vEthernet (Default Switch)',
-                           '以太网', '本地连接', 'WLAN', 'Wi-Fi']
-        all_adapters = list(dict.fromkeys(adapters + common_adapters))
-        self.adapter_combo['values'] = all_adapters
+        adapters = self.get_adapters(force=force)
+        seen = set()
+        all_adapters = [a for a in (*adapters, *COMMON_ADAPTERS) if not (a in seen or seen.add(a))]
+        # 完整列表留作输入过滤，下拉框只展示前若干项
+        self._all_adapters = all_adapters
+        self.adapter_combo['values'] = all_adapters[:self.COMBO_VISIBLE_LIMIT]
 
         if all_adapters:
             saved_adapter = self.config.get('adapter', '')
@@ -450,26 +671,44 @@ class IPSwitcher:
             else:
                 self.adapter_combo.current(0)
 
+    def on_adapter_filter(self, event):
+        """输入时按关键字过滤下拉项"""
+        if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        typed = self.adapter_combo.get().strip().lower()
+        if typed:
+            matches = [a for a in self._all_adapters if typed in a.lower()][:self.COMBO_FILTER_LIMIT]
+        else:
+            matches = self._all_adapters[:self.COMBO_VISIBLE_LIMIT]
+        self.adapter_combo['values'] = matches
+
     def on_adapter_change(self, event):
         """适配器选择变化时的处理"""
         pass
 
     def toggle_mode(self):
         """切换配置模式时启用/禁用输入框"""
-        state = 'disabled' if self.mode_var.get() == "auto" else 'normal'
+        # ttk 的 state() 直接修改状态位，比 config(state=...) 走完整的选项重配置更轻
+        new_state = ['disabled'] if self.mode_var.get() == "auto" else ['!disabled']
         for entry in self.entries.values():
-            entry.config(state=state)
+            entry.state(new_state)
 
     def validate_ip(self, ip):
-        """验证IP地址格式"""
-        pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if re.match(pattern, ip):
-            parts = ip.split('.')
-            return all(0 <= int(part) <= 255 for part in parts)
-        return False
+        """验证IP地址格式（点分四段的 IPv4 地址）"""
+        try:
+            ip = ip.strip()
+            ipaddress.IPv4Address(ip)
+        except (ValueError, AttributeError):
+            return False
+        return ip.count('.') == 3
 
     def show_debug_info(self):
-        """显示调试信息窗口"""
+        """显示调试信息窗口：先立即显示窗口，命令输出在后台收集后逐段追加"""
+        text_widget = self._build_debug_window()
+        self._executor.submit(self._collect_debug_info, text_widget)
+
+    def _build_debug_window(self):
+        """构建调试窗口（纯 Tk 布局），返回输出文本框"""
         debug_window = tk.Toplevel(self.root)
         debug_window.title("调试信息")
         debug_window.geometry("750x550")
@@ -494,7 +733,7 @@ class IPSwitcher:
                               yscrollcommand=scrollbar.set,
                               bg=DarkTheme.INPUT_BG,
                               fg=DarkTheme.FG_PRIMARY,
-                              font=('Consolas', 9),
+                              font=self.mono_font,
                               insertbackground=DarkTheme.FG_PRIMARY,
                               selectbackground=DarkTheme.ACCENT_BLUE,
                               selectforeground=DarkTheme.FG_PRIMARY,
@@ -504,75 +743,12 @@ class IPSwitcher:
         text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=text_widget.yview)
 
-        debug_info = "=== 网络适配器调试信息 ===\n\n"
-
-        try:
-            debug_info += "测试命令 1: netsh interface show interface\n"
-            debug_info += "-" * 60 + "\n"
-            result = subprocess.run(
-                'chcp 65001 & netsh interface show interface',
-                capture_output=True,
-                text=True,
-                shell=True,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            debug_info += f"返回码: {result.returncode}\n"
-            debug_info += f"输出:\n{result.stdout}\n"
-            if result.stderr:
-                debug_info += f"错误:\n{result.stderr}\n"
-            debug_info += "\n\n"
-
-            debug_info += "测试命令 2: netsh interface ip show config\n"
-            debug_info += "-" * 60 + "\n"
-            result = subprocess.run(
-                'chcp 65001 & netsh interface ip show config',
-                capture_output=True,
-                text=True,
-                shell=True,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            debug_info += f"返回码: {result.returncode}\n"
-            debug_info += f"输出:\n{result.stdout}\n"
-            if result.stderr:
-                debug_info += f"错误:\n{result.stderr}\n"
-            debug_info += "\n\n"
-
-            debug_info += "测试命令 3: 使用PowerShell获取网络适配器\n"
-            debug_info += "-" * 60 + "\n"
-            result = subprocess.run(
-                'powershell -Command "Get-NetAdapter | Where-Object {$_.Status -eq \'Up\'} | Select-Object -ExpandProperty Name"',
-                capture_output=True,
-                text=True,
-                shell=True,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            debug_info += f"返回码: {result.returncode}\n"
-            debug_info += f"输出:\n{result.stdout}\n"
-            if result.stderr:
-                debug_info += f"错误:\n{result.stderr}\n"
-            debug_info += "\n\n"
-
-            debug_info += "=== 解析到的适配器 ===\n"
-            debug_info += "-" * 60 + "\n"
-            adapters = self.get_adapters()
-            if adapters:
-                for i, adapter in enumerate(adapters, 1):
-                    debug_info += f"{i}. {adapter}\n"
-            else:
-                debug_info += "未检测到任何适配器\n"
-
-        except Exception as e:
-            debug_info += f"\n发生错误: {str(e)}\n"
-
-        text_widget.insert('1.0', debug_info)
+        text_widget.insert('1.0', "=== 网络适配器调试信息 ===\n\n正在收集...\n\n")
         text_widget.config(state='disabled')
 
         def copy_to_clipboard():
             self.root.clipboard_clear()
-            self.root.clipboard_append(debug_info)
+            self.root.clipboard_append(text_widget.get('1.0', 'end-1c'))
             self.show_custom_message("✓ 成功", "调试信息已复制到剪贴板", "info")
 
         btn_frame = tk.Frame(text_frame, bg=DarkTheme.BG_DARK)
@@ -593,6 +769,63 @@ class IPSwitcher:
                              bd=0)
         copy_btn.pack()
 
+        return text_widget
+
+    def _append_debug_text(self, text_widget, section):
+        """UI 线程：向调试窗口追加一段输出（窗口已关闭则忽略）"""
+        if not text_widget.winfo_exists():
+            return
+        text_widget.config(state='normal')
+        text_widget.insert(tk.END, section)
+        text_widget.config(state='disabled')
+
+    @staticmethod
+    def _format_debug_result(title, result):
+        section = f"{title}\n" + "-" * 60 + "\n"
+        section += f"返回码: {result.returncode}\n"
+        section += f"输出:\n{result.stdout}\n"
+        if result.stderr:
+            section += f"错误:\n{result.stderr}\n"
+        return section + "\n\n"
+
+    def _collect_debug_info(self, text_widget):
+        """后台线程：依次执行诊断命令，每完成一段即推送到 UI"""
+        def emit(section):
+            self.root.after(0, self._append_debug_text, text_widget, section)
+
+        try:
+            result = run_command(['netsh', 'interface', 'show', 'interface'], errors='ignore')
+            emit(self._format_debug_result("测试命令 1: netsh interface show interface", result))
+
+            cache = self._adapter_cache
+            if cache and cache[2] and time.monotonic() - cache[0] < self.ADAPTER_CACHE_TTL:
+                # 刚刷新过适配器时直接复用同一次 netsh 输出
+                emit("测试命令 2: netsh interface ip show config\n" + "-" * 60 + "\n"
+                     f"返回码: 0 (缓存)\n输出:\n{cache[2].decode(CONSOLE_ENCODING, 'ignore')}\n\n\n")
+            else:
+                result = run_command(['netsh', 'interface', 'ip', 'show', 'config'], errors='ignore')
+                emit(self._format_debug_result("测试命令 2: netsh interface ip show config", result))
+
+            result = run_command(['powershell', '-NoProfile', '-Command', PS_UP_ADAPTERS], errors='ignore')
+            emit(self._format_debug_result("测试命令 3: 使用PowerShell获取网络适配器", result))
+        except Exception as e:
+            emit(f"\n发生错误: {str(e)}\n")
+
+        # get_adapters 失败时会弹窗，须回到 UI 线程执行
+        self.root.after(0, self._append_parsed_adapters, text_widget)
+
+    def _append_parsed_adapters(self, text_widget):
+        section = "=== 解析到的适配器 ===\n" + "-" * 60 + "\n"
+        try:
+            adapters = self.get_adapters()
+            if adapters:
+                section += "".join(f"{i}. {adapter}\n" for i, adapter in enumerate(adapters, 1))
+            else:
+                section += "未检测到任何适配器\n"
+        except Exception as e:
+            section += f"\n发生错误: {str(e)}\n"
+        self._append_debug_text(text_widget, section)
+
     def get_current_ip(self):
         """获取当前适配器的IP配置"""
         adapter = self.adapter_combo.get()
@@ -601,55 +834,21 @@ class IPSwitcher:
             return
 
         try:
-            cmd = f'netsh interface ip show config "{adapter}"'
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=True,
-                encoding='gbk',
-                errors='ignore'
-            )
+            try:
+                info = next((a for a in query_adapter_addresses() if a['name'] == adapter), None)
+            except (OSError, AttributeError, ValueError):
+                info = None
+
+            if info:
+                self._apply_current_config(info['ip'], info['mask'], info['gateway'], info['dns'], info['dhcp'])
+                self.show_custom_message("✓ 成功", f"已获取适配器 [{adapter}] 的当前配置！", "info")
+                return
+
+            result = run_command(['netsh', 'interface', 'ip', 'show', 'config', f'name={adapter}'], errors='ignore')
 
             if result.returncode == 0 and result.stdout:
-                output = result.stdout
-
-                ip_match = re.search(r'IP [Aa]ddress.*?(\d+\.\d+\.\d+\.\d+)', output)
-                if ip_match:
-                    self.ip_entry.delete(0, tk.END)
-                    self.ip_entry.insert(0, ip_match.group(1))
-
-                mask_match = re.search(r'mask (\d+\.\d+\.\d+\.\d+)', output, re.IGNORECASE)
-                if mask_match:
-                    self.mask_entry.delete(0, tk.END)
-                    self.mask_entry.insert(0, mask_match.group(1))
-
-                gateway_match = re.search(r'[Dd]efault [Gg]ateway.*?(\d+\.\d+\.\d+\.\d+)', output)
-                if gateway_match:
-                    self.gateway_entry.delete(0, tk.END)
-                    self.gateway_entry.insert(0, gateway_match.group(1))
-
-                dns_matches = re.findall(r'(\d+\.\d+\.\d+\.\d+)', output)
-                dns_list = []
-                for match in dns_matches:
-                    if match not in [ip_match.group(1) if ip_match else '',
-                                     gateway_match.group(1) if gateway_match else '']:
-                        dns_list.append(match)
-
-                if len(dns_list) >= 1:
-                    self.dns1_entry.delete(0, tk.END)
-                    self.dns1_entry.insert(0, dns_list[0])
-
-                if len(dns_list) >= 2:
-                    self.dns2_entry.delete(0, tk.END)
-                    self.dns2_entry.insert(0, dns_list[1])
-
-                if 'DHCP' in output or 'dhcp' in output.lower():
-                    self.mode_var.set("auto")
-                else:
-                    self.mode_var.set("manual")
-
-                self.toggle_mode()
+                info = parse_netsh_config(result.stdout)
+                self._apply_current_config(info['ip'], info['mask'], info['gateway'], info['dns'], info['dhcp'])
                 self.show_custom_message("✓ 成功", f"已获取适配器 [{adapter}] 的当前配置！", "info")
             else:
                 self.show_custom_message("✗ 错误", "无法获取适配器信息\n请检查适配器名称是否正确", "error")
@@ -657,76 +856,95 @@ class IPSwitcher:
         except Exception as e:
             self.show_custom_message("✗ 错误", f"获取当前IP配置失败:\n{str(e)}", "error")
 
+    def _apply_current_config(self, ip, mask, gateway, dns_list, dhcp):
+        """将查询到的适配器配置写入输入框并切换模式"""
+        current = {
+            'ip': ip,
+            'mask': mask,
+            'gateway': gateway,
+            'dns1': dns_list[0] if dns_list else None,
+            'dns2': dns_list[1] if len(dns_list) > 1 else None
+        }
+        for key, value in current.items():
+            if value:
+                entry = self.entries[key]
+                entry.delete(0, tk.END)
+                entry.insert(0, value)
+
+        self.mode_var.set("auto" if dhcp else "manual")
+        self.toggle_mode()
+
     def apply_settings(self):
-        """应用网络设置"""
+        """应用网络设置（校验在 UI 线程，netsh 调用在后台线程）"""
         adapter = self.adapter_combo.get()
         if not adapter:
             self.show_custom_message("✗ 错误", "请选择或输入网络适配器名称！", "error")
             return
 
-        try:
-            if self.mode_var.get() == "auto":
-                cmd1 = f'netsh interface ip set address "{adapter}" dhcp'
-                result1 = subprocess.run(cmd1, shell=True, capture_output=True, text=True)
+        mode = self.mode_var.get()
+        values = None
+        if mode != "auto":
+            values = {key: entry.get().strip() for key, entry in self.entries.items()}
 
-                cmd2 = f'netsh interface ip set dns "{adapter}" dhcp'
-                result2 = subprocess.run(cmd2, shell=True, capture_output=True, text=True)
+            for key, error_msg in self.REQUIRED_FIELD_ERRORS:
+                # 网关可留空，其余字段必须为合法地址
+                if (values[key] or key != 'gateway') and not self.validate_ip(values[key]):
+                    self.show_custom_message("✗ 错误", error_msg, "error")
+                    return
 
-                if result1.returncode != 0 or result2.returncode != 0:
-                    error_msg = result1.stderr + result2.stderr
-                    raise Exception(f"命令执行失败:\n{error_msg}")
+        self.apply_btn.config(state='disabled', text="⏳ 应用中...")
+        future = self._executor.submit(self._run_apply_commands, adapter, mode, values)
+        future.add_done_callback(lambda f: self.root.after(0, self._on_apply_done, f))
 
-                self.show_custom_message("✓ 成功", "已切换到自动获取IP模式！\n可能需要几秒钟生效。", "info")
-            else:
-                ip = self.ip_entry.get()
-                mask = self.mask_entry.get()
-                gateway = self.gateway_entry.get().strip()
-                dns1 = self.dns1_entry.get()
-                dns2 = self.dns2_entry.get()
-
-                if not all([self.validate_ip(ip), self.validate_ip(mask)]):
-                    self.show_custom_message("✗ 错误", "IP地址或子网掩码格式不正确！", "error")
-                    return
+    def _run_apply_commands(self, adapter, mode, values):
+        """后台线程：执行 netsh 命令，成功返回提示文本，失败抛出异常"""
+        # 多条 netsh 串联为一次 cmd.exe 调用，只付出一次进程创建开销
+        # （此处仍需 shell 解释 &/&&，但同样不创建控制台窗口）
+        if mode == "auto":
+            # 用 & 而非 &&：适配器已是 DHCP 时 set address 会失败，但仍需把静态 DNS 改回 DHCP
+            cmd = (f'netsh interface ip set address "{adapter}" dhcp'
+                   f' & netsh interface ip set dns "{adapter}" dhcp')
+            result = run_command(cmd, shell=True)
 
-                if gateway and not self.validate_ip(gateway):
-                    self.show_custom_message("✗ 错误", "默认网关格式不正确！", "error")
-                    return
+            if result.returncode != 0:
+                raise Exception(f"命令执行失败:\n{result.stdout}{result.stderr}")
 
-                if not self.validate_ip(dns1):
-                    self.show_custom_message("✗ 错误", "首选DNS格式不正确！", "error")
-                    return
+            return "已切换到自动获取IP模式！\n可能需要几秒钟生效。"
 
-                # 根据是否有网关构建不同的命令
-                if gateway:
-                    cmd1 = f'netsh interface ip set address "{adapter}" static {ip} {mask} {gateway}'
-                else:
-                    cmd1 = f'netsh interface ip set address "{adapter}" static {ip} {mask}'
+        ip, mask, gateway = values['ip'], values['mask'], values['gateway']
+        dns1, dns2 = values['dns1'], values['dns2']
 
-                result1 = subprocess.run(cmd1, shell=True, capture_output=True, text=True, encoding='gbk',
-                                         errors='ignore')
+        # 根据是否有网关构建不同的命令
+        if gateway:
+            cmd = f'netsh interface ip set address "{adapter}" static {ip} {mask} {gateway}'
+        else:
+            cmd = f'netsh interface ip set address "{adapter}" static {ip} {mask}'
 
-                if result1.returncode != 0:
-                    raise Exception(f"设置IP失败:\n{result1.stderr}")
+        cmd += f' && netsh interface ip set dns "{adapter}" static {dns1}'
 
-                cmd2 = f'netsh interface ip set dns "{adapter}" static {dns1}'
-                result2 = subprocess.run(cmd2, shell=True, capture_output=True, text=True, encoding='gbk',
-                                         errors='ignore')
+        if dns2 and self.validate_ip(dns2):
+            cmd += (f' && (netsh interface ip add dns "{adapter}" {dns2} index=2'
+                    f' || echo {self.DNS2_FAILED_MARKER})')
 
-                if result2.returncode != 0:
-                    raise Exception(f"设置DNS失败:\n{result2.stderr}")
+        result = run_command(cmd, shell=True, errors='ignore')
 
-                if dns2 and self.validate_ip(dns2):
-                    cmd3 = f'netsh interface ip add dns "{adapter}" {dns2} index=2'
-                    subprocess.run(cmd3, shell=True, capture_output=True, text=True, encoding='gbk', errors='ignore')
+        if result.returncode != 0:
+            raise Exception(f"设置IP/DNS失败:\n{result.stdout}{result.stderr}")
 
-                self.show_custom_message("✓ 成功", "手动IP配置已应用！\n可能需要几秒钟生效。", "info")
+        if self.DNS2_FAILED_MARKER in result.stdout:
+            return "手动IP配置已应用，但备用DNS设置失败！\n可能需要几秒钟生效。"
+        return "手动IP配置已应用！\n可能需要几秒钟生效。"
 
+    def _on_apply_done(self, future):
+        """UI 线程：恢复按钮并显示结果"""
+        self.apply_btn.config(state='normal', text="✓ 应用设置")
+        try:
+            self.show_custom_message("✓ 成功", future.result(), "info")
         except Exception as e:
             self.show_custom_message("✗ 错误",
                                      f"应用设置失败！\n\n{str(e)}\n\n请确保：\n1. 以管理员身份运行此程序\n2. 适配器名称正确\n3. IP地址格式正确",
                                      "error")
 
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = IPSwitcher(root)
@@ -3,7 +3,87 @@ from tkinter import ttk, colorchooser, filedialog, messagebox
 import numpy as np
 from PIL import Image, ImageDraw, ImageTk
 import random
+import functools
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 可选依赖 numba：安装后波浪纹/噪声/渐变走并行 JIT 内核，否则使用 NumPy 实现
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def gradient_kernel(bg, fg, cos_a, sin_a, denom, out):
+        H, W = out.shape[0], out.shape[1]
+        for y in prange(H):
+            for x in range(W):
+                t = (x * cos_a + y * sin_a) / denom
+                t = min(max(t, 0.0), 1.0)
+                for c in range(3):
+                    out[y, x, c] = np.uint8(bg[c] * (1.0 - t) + fg[c] * t)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def noise_kernel(noise, scale, offset, out):
+        H, W = out.shape[0], out.shape[1]
+        for y in prange(H):
+            for x in range(W):
+                for c in range(3):
+                    v = noise[c, y, x] * scale + offset[c]
+                    out[y, x, c] = np.uint8(min(max(v, 0.0), 255.0))
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def waves_kernel(wavelength, amplitude, bg, fg, out):
+        H, W = out.shape[0], out.shape[1]
+        for y in prange(H):
+            for x in range(W):
+                for c in range(3):
+                    out[y, x, c] = bg[c]
+            x_offset = int(amplitude * np.sin(2 * np.pi * y / wavelength))
+            for x in range(0, W, 2):
+                px = x + x_offset
+                if 0 <= px < W:
+                    for c in range(3):
+                        out[y, px, c] = fg[c]
+
+    def warm_kernels():
+        """用 4×4 的小图触发一次编译，避免首次生成时卡顿"""
+        out = np.empty((4, 4, 3), np.uint8)
+        color = np.zeros(3, np.float64)
+        gradient_kernel(color, color, 1.0, 0.0, 4.0, out)
+        noise_kernel(np.zeros((3, 4, 4), np.uint8), 1.0, color, out)
+        waves_kernel(10, 1, np.zeros(3, np.uint8), np.zeros(3, np.uint8), out)
+
+
+def rgb_image(arr):
+    """把 C 连续的 (H, W, 3) uint8 数组直接当作原始 RGB 缓冲区交给 Pillow，只拷贝一次"""
+    height, width = arr.shape[:2]
+    return Image.frombuffer('RGB', (width, height), np.ascontiguousarray(arr), 'raw', 'RGB', 0, 1)
+
+
+# 六边形/星形顶点在单位圆上的方向 (cos, sin)，导入时计算一次
+HEX_UNIT = np.array([(math.cos(math.pi / 3 * i), math.sin(math.pi / 3 * i))
+                     for i in range(6)])
+STAR_UNIT = np.array([(math.cos(math.pi / 5 * i - math.pi / 2),
+                       math.sin(math.pi / 5 * i - math.pi / 2)) for i in range(10)])
+# 星形外/内顶点交替，内半径为外半径的一半
+STAR_RADII = np.array([1.0, 0.5] * 5)[:, None]
+
+@functools.lru_cache(maxsize=256)
+def button_colors(rgb):
+    """颜色按钮的 (背景十六进制串, 对比文字颜色)，同一颜色只格式化一次"""
+    text = 'white' if rgb[0] + rgb[1] + rgb[2] < 384 else 'black'
+    return '#%02x%02x%02x' % rgb, text
+
+
+# 需要在底图上用 ImageDraw 逐个绘制图元的图案；其余图案直接由数组生成整幅图像
+DRAWN_PATTERNS = frozenset({"圆形阵列", "矩形阵列", "随机圆点", "六边形", "三角形阵列", "星形阵列"})
+
+# 超过该像素数的画布才把平面运算按行带分给线程池，小图直接单线程完成
+PARALLEL_MIN_PIXELS = 1_000_000
 
 
 class TextureGenerator:
@@ -19,6 +99,27 @@ class TextureGenerator:
         self.fg_color = (0, 0, 0)
         self.current_image = None
 
+        # 渲染参数缓存：参数与随机种子都不变时直接复用上一张图
+        self._seed = random.getrandbits(64)
+        self._last_key = None
+        # 所有批量随机数都来自 numpy Generator；每次渲染前按 _seed 重新播种
+        self.rng = np.random.default_rng(self._seed)
+        # 图形顶点模板（相对中心的偏移），按 (形状, 尺寸) 缓存
+        self._shape_cache = {}
+        # 预览缓存：(原图, (画布宽, 画布高, 重采样方式))，命中时不再重新缩放
+        self._display_cache = None
+        self._hq_job = None
+        # 逐通道 (3, H, W) float32 平面缓冲区，画布尺寸不变时复用
+        self._fbuf = None
+        # 拖动滑块时的低分辨率预览任务（防抖）
+        self._preview_job = None
+        # NumPy 大数组运算会释放 GIL，大画布按行带并行
+        self._workers = os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=self._workers) if self._workers > 1 else None
+
+        if HAS_NUMBA:
+            warm_kernels()
+
         self.setup_ui()
         self.generate_texture()
 
@@ -71,7 +172,7 @@ class TextureGenerator:
         self.pattern_var = tk.StringVar(value="横线阵列")
         patterns = ["横线阵列", "竖线阵列", "圆形阵列", "矩形阵列",
                     "随机圆点", "棋盘格", "波浪纹", "六边形",
-                    "三角形阵列", "星形阵列", "噪声纹理", "渐变"]
+                    "三角形阵列", "星形阵列", "噪声纹理", "柏林噪声", "渐变"]
 
         for pattern in patterns:
             ttk.Radiobutton(pattern_frame, text=pattern, variable=self.pattern_var,
@@ -119,12 +220,17 @@ class TextureGenerator:
 
         param_frame.columnconfigure(2, weight=1)
 
+        # 拖动滑块时防抖生成半分辨率预览，松开后再按原尺寸生成
+        for scale in (density_scale, size_scale, random_scale, rotation_scale):
+            scale.bind('<B1-Motion>', self._schedule_preview)
+            scale.bind('<ButtonRelease-1>', self._finish_preview)
+
         # 按钮区域
         button_frame = ttk.Frame(control_frame)
         button_frame.pack(fill=tk.X, pady=10)
 
         ttk.Button(button_frame, text="生成纹理",
-                   command=self.generate_texture).pack(fill=tk.X, pady=2)
+                   command=self.regenerate_texture).pack(fill=tk.X, pady=2)
         ttk.Button(button_frame, text="保存图片",
                    command=self.save_image).pack(fill=tk.X, pady=2)
         ttk.Button(button_frame, text="随机生成",
@@ -137,42 +243,70 @@ class TextureGenerator:
         # 画布
         self.canvas = tk.Canvas(preview_frame, bg='gray', width=600, height=600)
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.canvas.bind('<Configure>', self._on_canvas_configure)
+
+    def _set_bg(self, rgb):
+        self.bg_color = rgb
+        hex_color, text_color = button_colors(rgb)
+        self.bg_color_btn.config(bg=hex_color, fg=text_color)
+
+    def _set_fg(self, rgb):
+        # 根据颜色亮度调整文字颜色
+        self.fg_color = rgb
+        hex_color, text_color = button_colors(rgb)
+        self.fg_color_btn.config(bg=hex_color, fg=text_color)
 
     def choose_bg_color(self):
         color = colorchooser.askcolor(title="选择背景色", initialcolor=self.bg_color)
         if color[0]:
-            self.bg_color = tuple(int(c) for c in color[0])
-            self.bg_color_btn.config(bg=color[1])
+            self._set_bg(tuple(int(c) for c in color[0]))
 
     def choose_fg_color(self):
         color = colorchooser.askcolor(title="选择前景色", initialcolor=self.fg_color)
         if color[0]:
-            self.fg_color = tuple(int(c) for c in color[0])
-            self.fg_color_btn.config(bg=color[1])
-            # 根据颜色亮度调整文字颜色
-            brightness = sum(self.fg_color) / 3
-            text_color = 'white' if brightness < 128 else 'black'
-            self.fg_color_btn.config(fg=text_color)
+            self._set_fg(tuple(int(c) for c in color[0]))
+
+    def regenerate_texture(self):
+        """“生成纹理”按钮：换一个随机种子重新生成，参数不变时也得到新的随机布局"""
+        self._seed = random.getrandbits(64)
+        self.generate_texture()
 
     def generate_texture(self):
-        self.width = self.size_var_canvas.get()
-        self.height = self.size_var_canvas.get()
+        canvas_size = self.size_var_canvas.get()
         pattern = self.pattern_var.get()
-
-        # 创建图像
-        img = Image.new('RGB', (self.width, self.height), self.bg_color)
-        draw = ImageDraw.Draw(img)
-
         density = self.density_var.get()
         size = self.size_var.get()
-        randomness = self.random_var.get() / 100.0
+        random_percent = self.random_var.get()
         rotation = self.rotation_var.get()
 
+        key = (pattern, canvas_size, density, size, random_percent, rotation,
+               self.bg_color, self.fg_color, self._seed)
+        if key == self._last_key and self.current_image is not None:
+            self.display_image(self.current_image)
+            return
+
+        img = self._render(pattern, canvas_size, density, size, random_percent / 100.0, rotation)
+
+        self.current_image = img
+        self._last_key = key
+        self.display_image(img)
+
+    def _render(self, pattern, canvas_size, density, size, randomness, rotation):
+        self.width = self.height = canvas_size
+        # 同一种子得到同一张图，保证缓存命中与重新生成的结果一致
+        self.rng = np.random.default_rng(self._seed)
+
+        # 只为逐图元绘制的图案创建底图和一个 ImageDraw，并在各绘制函数间共用
+        img = draw = None
+        if pattern in DRAWN_PATTERNS:
+            img = Image.new('RGB', (self.width, self.height), self.bg_color)
+            draw = ImageDraw.Draw(img)
+
         # 根据选择的图案生成纹理
         if pattern == "横线阵列":
-            self.draw_horizontal_lines(draw, density, size, randomness)
+            img = self.draw_horizontal_lines(density, size, randomness)
         elif pattern == "竖线阵列":
-            self.draw_vertical_lines(draw, density, size, randomness)
+            img = self.draw_vertical_lines(density, size, randomness)
         elif pattern == "圆形阵列":
             self.draw_circle_array(draw, density, size, randomness)
         elif pattern == "矩形阵列":
@@ -180,9 +314,9 @@ class TextureGenerator:
         elif pattern == "随机圆点":
             self.draw_random_dots(draw, density, size)
         elif pattern == "棋盘格":
-            self.draw_checkerboard(draw, density)
+            img = self.draw_checkerboard(density)
         elif pattern == "波浪纹":
-            self.draw_waves(draw, density, size)
+            img = self.draw_waves(density, size)
         elif pattern == "六边形":
             self.draw_hexagons(draw, density, size)
         elif pattern == "三角形阵列":
@@ -191,182 +325,328 @@ class TextureGenerator:
             self.draw_stars(draw, density, size, randomness)
         elif pattern == "噪声纹理":
             img = self.draw_noise(randomness)
+        elif pattern == "柏林噪声":
+            img = self.draw_perlin(density)
         elif pattern == "渐变":
             img = self.draw_gradient(rotation)
 
-        self.current_image = img
-        self.display_image(img)
+        return img
+
+    def _schedule_preview(self, event=None):
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self._preview_job = self.root.after(60, self._render_preview)
+
+    def _render_preview(self):
+        # 画布与尺寸参数同时减半，缩放显示后与全分辨率结果观感一致
+        self._preview_job = None
+        img = self._render(self.pattern_var.get(),
+                           max(32, self.size_var_canvas.get() // 2),
+                           max(1, self.density_var.get() // 2),
+                           max(1, self.size_var.get() // 2),
+                           self.random_var.get() / 100.0,
+                           self.rotation_var.get())
+        self.display_image(img, Image.Resampling.BILINEAR)
+
+    def _finish_preview(self, event=None):
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+            self._preview_job = None
+        self.generate_texture()
 
-    def draw_horizontal_lines(self, draw, density, size, randomness):
+    def _jitter_grid(self, ny, nx, *scales):
+        """一次性为 ny×nx 网格生成随机整数偏移，形状 (ny, nx, len(scales))"""
+        # 用 uniform 截断取整而不是 integers，保持原先 int(random.uniform(...)) 的偏移分布
+        rnd = self.rng.uniform(-1.0, 1.0, (ny, nx, len(scales))) * np.asarray(scales)
+        return rnd.astype(np.int32)
+
+    def _line_spans(self, length, spacing, size, randomness):
+        """按间距生成线条位置和粗细，返回每条线覆盖的 [起点, 终点) 像素区间"""
+        centers = np.arange(0, length, spacing)
+        jitter = self._jitter_grid(1, len(centers), spacing * randomness, size * randomness)[0]
+        centers = centers + jitter[:, 0]
+        thickness = np.maximum(1, size + jitter[:, 1])
+        # 与 ImageDraw.line 的宽线覆盖范围一致：[c - (t-1)//2, c + t//2]；
+        # 两端都限制在画布内，抖动到画布外的线条整条丢弃（负的终点会让切片从末尾回绕）
+        starts = np.clip(centers - (thickness - 1) // 2, 0, length)
+        stops = np.clip(centers + thickness // 2 + 1, 0, length)
+        keep = stops > starts
+        return zip(starts[keep].tolist(), stops[keep].tolist())
+
+    def draw_horizontal_lines(self, density, size, randomness):
+        # 每条线就是一段连续行的切片赋值
         spacing = max(5, density)
-        y = 0
-        while y < self.height:
-            offset = int(random.uniform(-spacing * randomness, spacing * randomness))
-            actual_y = y + offset
-            thickness = max(1, size + int(random.uniform(-size * randomness, size * randomness)))
-            draw.line([(0, actual_y), (self.width, actual_y)],
-                      fill=self.fg_color, width=thickness)
-            y += spacing
-
-    def draw_vertical_lines(self, draw, density, size, randomness):
+        arr = np.empty((self.height, self.width, 3), np.uint8)
+        arr[:] = self.bg_color
+        fg = self.fg_color
+        for y0, y1 in self._line_spans(self.height, spacing, size, randomness):
+            arr[y0:y1] = fg
+        return rgb_image(arr)
+
+    def draw_vertical_lines(self, density, size, randomness):
         spacing = max(5, density)
-        x = 0
-        while x < self.width:
-            offset = int(random.uniform(-spacing * randomness, spacing * randomness))
-            actual_x = x + offset
-            thickness = max(1, size + int(random.uniform(-size * randomness, size * randomness)))
-            draw.line([(actual_x, 0), (actual_x, self.height)],
-                      fill=self.fg_color, width=thickness)
-            x += spacing
+        arr = np.empty((self.height, self.width, 3), np.uint8)
+        arr[:] = self.bg_color
+        fg = self.fg_color
+        for x0, x1 in self._line_spans(self.width, spacing, size, randomness):
+            arr[:, x0:x1] = fg
+        return rgb_image(arr)
+
+    def _jittered_boxes(self, spacing, half_size, randomness):
+        """网格中心与半径同时加随机偏移，返回每个格子的包围盒 [x0, y0, x1, y1] 列表"""
+        ys = np.arange(0, self.height, spacing)[:, None]
+        xs = np.arange(0, self.width, spacing)[None, :]
+        jitter = self._jitter_grid(ys.shape[0], xs.shape[1], spacing * randomness,
+                                   spacing * randomness, half_size * randomness)
+        cx = xs + jitter[..., 0]
+        cy = ys + jitter[..., 1]
+        r = np.maximum(1, half_size + jitter[..., 2])
+        return np.stack([cx - r, cy - r, cx + r, cy + r], axis=-1).reshape(-1, 4).tolist()
 
     def draw_circle_array(self, draw, density, size, randomness):
+        # 坐标计算全部在 NumPy 中完成，循环里只剩 ellipse 调用
         spacing = max(10, density)
-        radius = max(1, size)
-
-        for y in range(0, self.height, spacing):
-            for x in range(0, self.width, spacing):
-                offset_x = int(random.uniform(-spacing * randomness, spacing * randomness))
-                offset_y = int(random.uniform(-spacing * randomness, spacing * randomness))
-                actual_x = x + offset_x
-                actual_y = y + offset_y
-                actual_radius = max(1, radius + int(random.uniform(-radius * randomness,
-                                                                   radius * randomness)))
-
-                draw.ellipse([actual_x - actual_radius, actual_y - actual_radius,
-                              actual_x + actual_radius, actual_y + actual_radius],
-                             fill=self.fg_color)
+        ellipse = draw.ellipse
+        fg = self.fg_color
+        for box in self._jittered_boxes(spacing, max(1, size), randomness):
+            ellipse(box, fill=fg)
 
     def draw_rectangle_array(self, draw, density, size, randomness):
         spacing = max(10, density)
-        rect_size = max(1, size)
-
-        for y in range(0, self.height, spacing):
-            for x in range(0, self.width, spacing):
-                offset_x = int(random.uniform(-spacing * randomness, spacing * randomness))
-                offset_y = int(random.uniform(-spacing * randomness, spacing * randomness))
-                actual_x = x + offset_x
-                actual_y = y + offset_y
-                actual_size = max(1, rect_size + int(random.uniform(-rect_size * randomness,
-                                                                    rect_size * randomness)))
-
-                draw.rectangle([actual_x - actual_size, actual_y - actual_size,
-                                actual_x + actual_size, actual_y + actual_size],
-                               fill=self.fg_color)
+        rectangle = draw.rectangle
+        fg = self.fg_color
+        for box in self._jittered_boxes(spacing, max(1, size), randomness):
+            rectangle(box, fill=fg)
 
     def draw_random_dots(self, draw, density, size):
-        num_dots = int((self.width * self.height) / (density * density) * 10)
+        # 圆心/半径一次性由 NumPy 生成并预先算好包围盒，循环里只剩 ellipse 调用
+        W, H = self.width, self.height
+        integers = self.rng.integers
+        num_dots = int((W * H) / (density * density) * 10)
         radius = max(1, size)
 
-        for _ in range(num_dots):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            r = random.randint(1, radius)
-            draw.ellipse([x - r, y - r, x + r, y + r], fill=self.fg_color)
+        xs = integers(0, W + 1, num_dots)
+        ys = integers(0, H + 1, num_dots)
+        rs = integers(1, radius + 1, num_dots)
+        boxes = np.stack([xs - rs, ys - rs, xs + rs, ys + rs], axis=1).tolist()
 
-    def draw_checkerboard(self, draw, density):
+        ellipse = draw.ellipse
+        fg = self.fg_color
+        for box in boxes:
+            ellipse(box, fill=fg)
+
+    def draw_checkerboard(self, density):
+        # 只构造奇/偶两种行，再按每行所在格子的奇偶性整行拷贝
         square_size = max(5, density)
+        palette = np.array([self.fg_color, self.bg_color], np.uint8)
+
+        col_parity = (np.arange(self.width) // square_size) & 1
+        row_parity = (np.arange(self.height) // square_size) & 1
+        two_rows = np.stack([palette[col_parity], palette[col_parity ^ 1]])
+        arr = two_rows[row_parity]
 
-        for y in range(0, self.height, square_size):
-            for x in range(0, self.width, square_size):
-                if (x // square_size + y // square_size) % 2 == 0:
-                    draw.rectangle([x, y, x + square_size, y + square_size],
-                                   fill=self.fg_color)
+        return rgb_image(arr)
 
-    def draw_waves(self, draw, density, size):
+    def draw_waves(self, density, size):
+        # 一次性计算全部波纹点坐标，按掩码批量写入像素
+        W, H = self.width, self.height
         wavelength = max(10, density)
         amplitude = max(1, size)
 
-        for y in range(self.height):
-            x_offset = int(amplitude * math.sin(2 * math.pi * y / wavelength))
-            for x in range(0, self.width, 2):
-                if 0 <= x + x_offset < self.width:
-                    draw.point((x + x_offset, y), fill=self.fg_color)
+        if HAS_NUMBA:
+            out = np.empty((H, W, 3), np.uint8)
+            waves_kernel(wavelength, amplitude, np.asarray(self.bg_color, np.uint8),
+                         np.asarray(self.fg_color, np.uint8), out)
+            return rgb_image(out)
+
+        ys = np.arange(H)
+        x_offsets = (amplitude * np.sin(2 * np.pi * ys / wavelength)).astype(np.int32)
+        xs = np.arange(0, W, 2)
+        X = xs[None, :] + x_offsets[:, None]
+        mask = (X >= 0) & (X < W)
+        Y = np.broadcast_to(ys[:, None], X.shape)
+
+        arr = np.empty((H, W, 3), np.uint8)
+        arr[:] = self.bg_color
+        arr[Y[mask], X[mask]] = self.fg_color
+
+        return rgb_image(arr)
+
+    def _shape_offsets(self, shape, size):
+        """图形各顶点相对中心的偏移 (K, 2)，由单位方向表按尺寸缩放得到"""
+        key = (shape, size)
+        offsets = self._shape_cache.get(key)
+        if offsets is None:
+            if shape == 'hexagon':
+                offsets = size * HEX_UNIT
+            else:
+                offsets = (size * STAR_RADII) * STAR_UNIT
+            self._shape_cache[key] = offsets
+        return offsets
+
+    def _grid_centers(self, spacing, randomness):
+        """网格中心加随机偏移，按行优先返回 (N, 2) 的 (x, y)"""
+        ys = np.arange(0, self.height, spacing)
+        xs = np.arange(0, self.width, spacing)
+        jitter = self._jitter_grid(len(ys), len(xs), spacing * randomness, spacing * randomness)
+        cx = xs[None, :] + jitter[..., 0]
+        cy = ys[:, None] + jitter[..., 1]
+        return np.stack([cx, cy], axis=-1).reshape(-1, 2)
+
+    def _polygons(self, centers, offsets):
+        """把顶点模板平移到所有中心，返回可直接传给 draw.polygon 的坐标列表"""
+        return (centers[:, None, :] + offsets[None, :, :]).reshape(len(centers), -1).tolist()
 
     def draw_hexagons(self, draw, density, size):
         spacing = max(15, density)
         hex_size = max(5, size)
+        row_step = int(spacing * 1.5)
+
+        rows = np.arange(0, self.height, row_step)
+        cols = np.arange(0, self.width, spacing)
+        shift = np.where((rows // row_step) % 2 == 1, spacing // 2, 0)
+        cx = cols[None, :] + shift[:, None]
+        cy = np.broadcast_to(rows[:, None], cx.shape)
+        centers = np.stack([cx, cy], axis=-1).reshape(-1, 2)
 
-        for row in range(0, self.height, int(spacing * 1.5)):
-            for col in range(0, self.width, spacing):
-                x = col + (spacing // 2 if (row // int(spacing * 1.5)) % 2 else 0)
-                y = row
-                self.draw_hexagon(draw, x, y, hex_size)
-
-    def draw_hexagon(self, draw, x, y, size):
-        points = []
-        for i in range(6):
-            angle = math.pi / 3 * i
-            px = x + size * math.cos(angle)
-            py = y + size * math.sin(angle)
-            points.append((px, py))
-        draw.polygon(points, outline=self.fg_color, fill=None)
+        polygon = draw.polygon
+        fg = self.fg_color
+        for points in self._polygons(centers, self._shape_offsets('hexagon', hex_size)):
+            polygon(points, outline=fg, fill=None)
 
     def draw_triangles(self, draw, density, size, randomness):
         spacing = max(15, density)
         tri_size = max(5, size)
+        offsets = np.array([(0, -tri_size), (-tri_size, tri_size), (tri_size, tri_size)])
 
-        for y in range(0, self.height, spacing):
-            for x in range(0, self.width, spacing):
-                offset_x = int(random.uniform(-spacing * randomness, spacing * randomness))
-                offset_y = int(random.uniform(-spacing * randomness, spacing * randomness))
-                cx = x + offset_x
-                cy = y + offset_y
-
-                points = [
-                    (cx, cy - tri_size),
-                    (cx - tri_size, cy + tri_size),
-                    (cx + tri_size, cy + tri_size)
-                ]
-                draw.polygon(points, fill=self.fg_color)
+        polygon = draw.polygon
+        fg = self.fg_color
+        for points in self._polygons(self._grid_centers(spacing, randomness), offsets):
+            polygon(points, fill=fg)
 
     def draw_stars(self, draw, density, size, randomness):
         spacing = max(20, density)
         star_size = max(5, size)
 
-        for y in range(0, self.height, spacing):
-            for x in range(0, self.width, spacing):
-                offset_x = int(random.uniform(-spacing * randomness, spacing * randomness))
-                offset_y = int(random.uniform(-spacing * randomness, spacing * randomness))
-                cx = x + offset_x
-                cy = y + offset_y
-                self.draw_star(draw, cx, cy, star_size)
-
-    def draw_star(self, draw, x, y, size):
-        points = []
-        for i in range(10):
-            angle = math.pi / 5 * i - math.pi / 2
-            radius = size if i % 2 == 0 else size / 2
-            px = x + radius * math.cos(angle)
-            py = y + radius * math.sin(angle)
-            points.append((px, py))
-        draw.polygon(points, fill=self.fg_color)
+        polygon = draw.polygon
+        fg = self.fg_color
+        centers = self._grid_centers(spacing, randomness)
+        for points in self._polygons(centers, self._shape_offsets('star', star_size)):
+            polygon(points, fill=fg)
 
     def draw_noise(self, intensity):
-        arr = np.random.rand(self.height, self.width, 3) * 255 * intensity
-        base = np.array(self.bg_color)
-        arr = base + (arr - 128) * intensity
-        arr = np.clip(arr, 0, 255).astype(np.uint8)
-        return Image.fromarray(arr, 'RGB')
+        # base + (n*i - 128)*i 展开为 n*i² + (base - 128*i)，按通道平面采样与运算
+        noise = self.rng.integers(0, 256, (3, self.height, self.width), dtype=np.uint8)
+        offset = np.asarray(self.bg_color, np.float64) - 128 * intensity
+        if HAS_NUMBA:
+            out = np.empty((self.height, self.width, 3), np.uint8)
+            noise_kernel(noise, intensity * intensity, offset, out)
+            return rgb_image(out)
+
+        fbuf = self._float_planes()
+        scale = np.float32(intensity * intensity)
+
+        def work(row0, row1):
+            band = fbuf[:, row0:row1]
+            np.multiply(noise[:, row0:row1], scale, out=band)
+            for c in range(3):
+                band[c] += offset[c]
+            np.clip(band, 0, 255, out=band)
+
+        self._run_bands(work)
+        return self._pack_planes(fbuf)
+
+    def draw_perlin(self, density):
+        # 2D Perlin 噪声：格点随机单位梯度，像素对四个角点求点积后按 fade 曲线插值。
+        # 格子边长为整数，所有格子内的小数坐标完全相同，因此按 (行格, 格内行, 列格, 格内列)
+        # 四维广播计算，无需逐像素索引梯度表
+        cell = max(5, density)
+        ny = -(-self.height // cell)
+        nx = -(-self.width // cell)
+        frac = np.arange(cell, dtype=np.float32) / cell
+        fy = frac[None, :, None, None]
+        fx = frac[None, None, None, :]
+
+        theta = self.rng.uniform(0, 2 * np.pi, (ny + 1, nx + 1))
+        grad_x = np.cos(theta).astype(np.float32)
+        grad_y = np.sin(theta).astype(np.float32)
+
+        def corner(dy, dx):
+            gx = grad_x[dy:dy + ny, dx:dx + nx][:, None, :, None]
+            gy = grad_y[dy:dy + ny, dx:dx + nx][:, None, :, None]
+            return gx * (fx - dx) + gy * (fy - dy)
+
+        u = fx * fx * (3 - 2 * fx)
+        v = fy * fy * (3 - 2 * fy)
+        top = corner(0, 0)
+        top = top + u * (corner(0, 1) - top)
+        bottom = corner(1, 0)
+        bottom = bottom + u * (corner(1, 1) - bottom)
+        noise = (top + v * (bottom - top)).reshape(ny * cell, nx * cell)
+        noise = noise[:self.height, :self.width]
+
+        # 2D Perlin 的取值范围是 ±√2/2，映射到 [0, 1] 后在背景色与前景色之间插值
+        t = np.clip(noise * np.float32(math.sqrt(0.5)) + np.float32(0.5), 0, 1)
+        return self._pack_planes(self._blend_planes(t))
 
     def draw_gradient(self, angle):
-        arr = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-
+        # 整幅图一次性广播计算，避免逐像素 Python 循环
         angle_rad = math.radians(angle)
-        for y in range(self.height):
-            for x in range(self.width):
-                # 计算梯度值
-                t = (x * math.cos(angle_rad) + y * math.sin(angle_rad)) / \
-                    (self.width * abs(math.cos(angle_rad)) + self.height * abs(math.sin(angle_rad)))
-                t = max(0, min(1, t))
+        cos_a, sin_a = math.cos(angle_rad), math.sin(angle_rad)
+        denom = self.width * abs(cos_a) + self.height * abs(sin_a)
+
+        if HAS_NUMBA:
+            out = np.empty((self.height, self.width, 3), np.uint8)
+            gradient_kernel(np.asarray(self.bg_color, np.float64),
+                            np.asarray(self.fg_color, np.float64), cos_a, sin_a, denom, out)
+            return rgb_image(out)
+
+        xs = np.arange(self.width, dtype=np.float32)
+        ys = np.arange(self.height, dtype=np.float32)[:, None]
+        t = np.clip((xs * cos_a + ys * sin_a) / denom, 0, 1)
+        return self._pack_planes(self._blend_planes(t))
+
+    def _float_planes(self):
+        """(3, H, W) float32 通道平面缓冲区，尺寸变化时才重新分配"""
+        shape = (3, self.height, self.width)
+        if self._fbuf is None or self._fbuf.shape != shape:
+            self._fbuf = np.empty(shape, np.float32)
+        return self._fbuf
+
+    def _run_bands(self, work):
+        """对 [0, H) 调用 work(row0, row1)；大画布按行带分给线程池并等待全部完成"""
+        height = self.height
+        if self._pool is None or self.width * height < PARALLEL_MIN_PIXELS:
+            work(0, height)
+            return
+        edges = np.linspace(0, height, self._workers + 1).astype(int).tolist()
+        list(self._pool.map(work, edges[:-1], edges[1:]))
+
+    def _blend_planes(self, t):
+        """按 t∈[0,1] 在背景色与前景色之间插值，每个通道是一整块连续平面运算"""
+        fbuf = self._float_planes()
+        colors = list(zip(self.bg_color, self.fg_color))
+
+        def work(row0, row1):
+            for c, (bg, fg) in enumerate(colors):
+                band = fbuf[c, row0:row1]
+                np.multiply(t[row0:row1], np.float32(fg - bg), out=band)
+                band += bg
 
-                # 插值颜色
-                color = tuple(int(self.bg_color[i] * (1 - t) + self.fg_color[i] * t)
-                              for i in range(3))
-                arr[y, x] = color
+        self._run_bands(work)
+        return fbuf
 
-        return Image.fromarray(arr, 'RGB')
+    def _pack_planes(self, fbuf):
+        """通道平面交错打包为 (H, W, 3) uint8，整条流水线只在这里量化一次"""
+        out = np.empty((self.height, self.width, 3), np.uint8)
 
-    def display_image(self, img):
+        def work(row0, row1):
+            np.copyto(out[row0:row1], fbuf[:, row0:row1].transpose(1, 2, 0), casting='unsafe')
+
+        self._run_bands(work)
+        return rgb_image(out)
+
+    def display_image(self, img, resample=Image.Resampling.LANCZOS):
         # 缩放图像以适应画布
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
@@ -375,6 +655,12 @@ class TextureGenerator:
             canvas_width = 600
             canvas_height = 600
 
+        # 同一张图、同样的画布尺寸已经显示过，直接沿用现有 PhotoImage
+        cache_key = (canvas_width, canvas_height, resample)
+        if (self._display_cache is not None and self._display_cache[0] is img
+                and self._display_cache[1] == cache_key):
+            return
+
         img_ratio = img.width / img.height
         canvas_ratio = canvas_width / canvas_height
 
@@ -385,13 +671,28 @@ class TextureGenerator:
             new_height = canvas_height
             new_width = int(canvas_height * img_ratio)
 
-        display_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        display_img = img.resize((new_width, new_height), resample)
         self.photo = ImageTk.PhotoImage(display_img)
+        self._display_cache = (img, cache_key)
 
         self.canvas.delete("all")
         self.canvas.create_image(canvas_width // 2, canvas_height // 2,
                                  image=self.photo, anchor=tk.CENTER)
 
+    def _on_canvas_configure(self, event):
+        # 拖动窗口时先用 BILINEAR 快速预览，停止 200ms 后再用 LANCZOS 重绘
+        if self.current_image is None:
+            return
+        self.display_image(self.current_image, Image.Resampling.BILINEAR)
+        if self._hq_job is not None:
+            self.root.after_cancel(self._hq_job)
+        self._hq_job = self.root.after(200, self._redraw_hq)
+
+    def _redraw_hq(self):
+        self._hq_job = None
+        if self.current_image is not None:
+            self.display_image(self.current_image)
+
     def save_image(self):
         if self.current_image is None:
             messagebox.showwarning("警告", "没有可保存的图像!")
@@ -411,7 +712,7 @@ class TextureGenerator:
         # 随机选择参数
         patterns = ["横线阵列", "竖线阵列", "圆形阵列", "矩形阵列",
                     "随机圆点", "棋盘格", "波浪纹", "六边形",
-                    "三角形阵列", "星形阵列", "噪声纹理", "渐变"]
+                    "三角形阵列", "星形阵列", "噪声纹理", "柏林噪声", "渐变"]
         self.pattern_var.set(random.choice(patterns))
 
         self.density_var.set(random.randint(10, 80))
@@ -420,18 +721,10 @@ class TextureGenerator:
         self.rotation_var.set(random.randint(0, 360))
 
         # 随机颜色
-        self.bg_color = (random.randint(0, 255), random.randint(0, 255),
-                         random.randint(0, 255))
-        self.fg_color = (random.randint(0, 255), random.randint(0, 255),
-                         random.randint(0, 255))
-
-        self.bg_color_btn.config(bg='#%02x%02x%02x' % self.bg_color)
-        self.fg_color_btn.config(bg='#%02x%02x%02x' % self.fg_color)
-
-        brightness = sum(self.fg_color) / 3
-        text_color = 'white' if brightness < 128 else 'black'
-        self.fg_color_btn.config(fg=text_color)
+        self._set_bg((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+        self._set_fg((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
 
+        self._seed = random.getrandbits(64)
         self.generate_texture()
 
 
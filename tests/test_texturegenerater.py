@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from pytools_texturegenerater import TextureGenerator
+
+
+def make_generator(seed, size=256):
+    """不创建 Tk 窗口，只准备绘制函数用到的属性"""
+    gen = TextureGenerator.__new__(TextureGenerator)
+    gen.width = gen.height = size
+    gen.bg_color = (0, 0, 0)
+    gen.fg_color = (255, 255, 255)
+    gen.rng = np.random.default_rng(seed)
+    return gen
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('method', ['draw_horizontal_lines', 'draw_vertical_lines'])
+def test_jittered_line_coverage(method, seed):
+    # 抖动把线条推到画布外时不能回绕涂满整张图，覆盖率应接近 size / spacing
+    density, size, randomness = 20, 2, 0.5
+    img = getattr(make_generator(seed), method)(density, size, randomness)
+    arr = np.asarray(img)[..., 0]
+    lines = arr.all(axis=1) if method == 'draw_horizontal_lines' else arr.all(axis=0)
+    assert (arr == 255).mean() == pytest.approx(lines.mean())
+    assert lines.mean() == pytest.approx(size / density, abs=0.1)
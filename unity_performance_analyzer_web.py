@@ -10,9 +10,372 @@ import numpy as np
 import json
 import webbrowser
 import os
+import sys
+import re
+import html
+import math
+import hashlib
+import pickle
+import gzip
+import base64
+from collections import namedtuple
 from pathlib import Path
 from datetime import datetime
 
+# 可选依赖 polars（转 pandas 需要 pyarrow）：安装后用多线程 CSV 读取器加载，否则回退到 pandas
+try:
+    import polars as pl
+    import pyarrow  # noqa: F401
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+# 嵌入报告的分析数据（UTF-8 字节）：优先使用 orjson（可选依赖），否则回退到标准库 json；
+# 均输出紧凑格式，NaN/Inf 输出为 null（页面用 JSON.parse 读取）
+try:
+    import orjson
+
+    def _dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _json_safe(obj):
+        """NumPy 数组/标量转为 Python 原生类型，NaN/Inf 转为 None"""
+        if isinstance(obj, dict):
+            return {k: _json_safe(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [_json_safe(v) for v in obj]
+        if isinstance(obj, (np.ndarray, np.generic)):
+            return _json_safe(obj.tolist())
+        if isinstance(obj, float) and not math.isfinite(obj):
+            return None
+        return obj
+
+    def _dumps(data):
+        return json.dumps(_json_safe(data), ensure_ascii=False, separators=(',', ':'),
+                          allow_nan=False).encode('utf-8')
+
+# 可选依赖 numba：安装后流式统计的逐批矩计算走并行 JIT 内核，否则使用 NumPy 实现
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    # 需要跳过 NaN，只开启允许重排求和的 fastmath 选项
+    @njit(parallel=True, fastmath={'reassoc', 'contract'}, cache=True)
+    def moments_kernel(values):
+        n = values.size
+        blocks = 64
+        step = (n + blocks - 1) // blocks
+        part = np.empty((blocks, 7))
+        for b in prange(blocks):
+            count = 0
+            total = 0.0
+            sq = 0.0
+            lo = np.inf
+            hi = -np.inf
+            first = np.nan
+            last = np.nan
+            for i in range(b * step, min(n, (b + 1) * step)):
+                v = values[i]
+                if not np.isnan(v):
+                    if count == 0:
+                        first = v
+                    last = v
+                    count += 1
+                    total += v
+                    sq += v * v
+                    lo = min(lo, v)
+                    hi = max(hi, v)
+            part[b, 0] = count
+            part[b, 1] = total
+            part[b, 2] = sq
+            part[b, 3] = lo
+            part[b, 4] = hi
+            part[b, 5] = first
+            part[b, 6] = last
+
+        first = np.nan
+        last = np.nan
+        for b in range(blocks):
+            if part[b, 0] > 0:
+                if np.isnan(first):
+                    first = part[b, 5]
+                last = part[b, 6]
+        return (part[:, 0].sum(), part[:, 1].sum(), part[:, 2].sum(),
+                part[:, 3].min(), part[:, 4].max(), first, last)
+
+# 下游分析实际用到的列，加载时只解析这些
+ANOMALY_COLS = ['IsAnomaly', '是否异常', 'Anomaly', 'isAnomaly']
+USED_COLS = ['Timestamp', 'FPS', 'TotalAllocated_MB', 'MonoUsed_MB', 'GCAllocThisFrame_KB',
+             'DrawCalls', 'Triangles', 'CPUFrameTime_ms', 'GPUFrameTime_ms', 'GPU_ms', 'GPUTime_ms',
+             'CurrentSceneName'] + ANOMALY_COLS
+
+# 除时间戳外的数值列以 float32/int32 载入，归约时搬运的字节减半（时间戳是累计秒数，保留 float64）
+FLOAT32_COLS = ['FPS', 'TotalAllocated_MB', 'MonoUsed_MB', 'GCAllocThisFrame_KB', 'CPUFrameTime_ms',
+                'GPUFrameTime_ms', 'GPU_ms', 'GPUTime_ms']
+INT32_COLS = ['DrawCalls', 'Triangles']
+
+if HAS_POLARS:
+    # 异常标记列的取值形式不固定（布尔/0-1/'是'），交给 polars 自行推断；
+    # 计数列也由 polars 推断（可能写成 120.0 这样的浮点），推断为整数时再降为 Int32
+    SCHEMA = {'Timestamp': pl.Float64, 'CurrentSceneName': pl.String}
+    SCHEMA.update({col: pl.Float32 for col in FLOAT32_COLS})
+
+# 超过该大小的CSV不整体载入内存，改为分批流式统计
+STREAMING_MIN_BYTES = 512 * 1024 * 1024
+STREAM_BATCH_ROWS = 1_000_000
+# 流式模式下相关性、CPU/GC 分位数和FPS趋势线使用的蓄水池抽样行数
+STREAM_SAMPLE_SIZE = 20_000
+# 流式模式下FPS按 0.01 精度计入定宽直方图（清洗后 0 < FPS < 1000），分位数由累计计数得到
+FPS_HIST_SCALE = 100
+FPS_HIST_BINS = 1000 * FPS_HIST_SCALE + 1
+STREAM_STAT_COLS = ['FPS', 'TotalAllocated_MB', 'GCAllocThisFrame_KB', 'CPUFrameTime_ms',
+                    'DrawCalls', 'Triangles']
+# 报告页面模板（与脚本同目录，打包后位于 _MEIPASS），__DATA__ 处写入分析数据
+REPORT_TEMPLATE_FILE = 'unity_performance_report_template.html'
+# 分析结果缓存目录；分析逻辑或结果结构变化时递增版本号使旧缓存失效
+RESULTS_CACHE_DIR = Path('performance_analysis') / '.cache'
+RESULTS_CACHE_VERSION = 9
+# 单帧GC分配超过该值（KB）计为一次尖峰
+GC_SPIKE_KB = 500
+# FPS分布图的等宽区间数
+FPS_DIST_BINS = 30
+# 每条图表曲线最多嵌入的点数（约为图表宽度的 2 倍），统计值仍基于全部数据
+CHART_MAX_POINTS = 2000
+# MinMax-LTTB 预选的候选点数与输出点数之比
+CHART_MINMAX_RATIO = 4
+# 流式模式下图表候选点的等宽行号桶数（每桶保留FPS最小、最大两行，即 MinMax-LTTB 的预选点数）
+STREAM_CHART_BUCKETS = CHART_MAX_POINTS * CHART_MINMAX_RATIO // 2
+# 流式模式下最多嵌入的异常帧标记数，超出时按出现顺序等间隔抽取
+STREAM_ANOMALY_MAX_POINTS = 20_000
+# 图表数据列（与 _prepare_chart_data 的键对应）
+CHART_COLS = {'TotalAllocated_MB': 'memory_total', 'MonoUsed_MB': 'memory_mono',
+              'GCAllocThisFrame_KB': 'gc_alloc', 'CPUFrameTime_ms': 'cpu_time', 'DrawCalls': 'draw_calls'}
+# 嵌入报告时各曲线保留的小数位（0 为取整），远低于屏幕可分辨的精度
+CHART_DECIMALS = {'timestamps': 3, 'fps': 2, 'fps_trend': 2, 'memory_total': 0, 'memory_mono': 0,
+                  'gc_alloc': 1, 'cpu_time': 2, 'gpu_time': 2, 'draw_calls': 0}
+
+
+# 评分/问题检测/移动端预测共用的汇总指标（缺少对应列时 mem_max、gc_mean 为 0）
+Metrics = namedtuple('Metrics', ['fps_mean', 'mem_max', 'gc_mean'])
+
+
+def anomaly_mask(df, prev_fps=np.nan):
+    """计算异常帧掩码，返回 (mask, 检测方式)"""
+    for col in ANOMALY_COLS:
+        if col in df.columns:
+            values = df[col]
+            # 处理不同的数据类型
+            if values.dtype == bool:
+                return values.to_numpy(), 'manual'
+            if values.dtype in ['int64', 'int32']:
+                return (values == 1).to_numpy(), 'manual'
+            # 字符串类型：'是', 'True', '1'等
+            return values.isin(['是', 'True', '1', 1, True]).to_numpy(), 'manual'
+
+    if 'FPS' not in df.columns:
+        return np.zeros(len(df), dtype=bool), 'auto'
+
+    # 没有异常列时基于FPS自动判断：FPS < 30 或者突降超过20 FPS（prev_fps 为上一批最后一帧）
+    fps = df['FPS'].to_numpy()
+    return (fps < 30) | (np.diff(fps, prepend=prev_fps) < -20), 'auto'
+
+
+def correlation_dict(columns):
+    """FPS 与各资源指标的 Pearson 相关系数（剔除含 NaN 的行），返回 {列: {列: 系数}}"""
+    names = ['FPS'] + [c for c in ['TotalAllocated_MB', 'GCAllocThisFrame_KB', 'DrawCalls', 'CPUFrameTime_ms']
+                       if c in columns]
+    if 'FPS' not in columns or len(names) < 2:
+        return {}
+
+    arr = np.column_stack([columns[c] for c in names]).astype(np.float64, copy=False)
+    arr = arr[~np.isnan(arr).any(axis=1)]
+    # 常量列的系数为 NaN，与 DataFrame.corr 一致
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(arr, rowvar=False).tolist()
+    return {a: dict(zip(names, row)) for a, row in zip(names, corr)}
+
+
+def histogram_quantiles(counts, qs, scale):
+    """由定宽直方图求线性插值分位数（与 np.quantile 默认方法一致，精度为 1/scale）"""
+    cum = np.cumsum(counts)
+    pos = np.asarray(qs) * (cum[-1] - 1)
+    lower = np.floor(pos)
+    v_lower = np.searchsorted(cum, lower, side='right')
+    v_upper = np.searchsorted(cum, np.ceil(pos), side='right')
+    return ((v_lower + (pos - lower) * (v_upper - v_lower)) / scale).tolist()
+
+
+def _report_template():
+    """读取报告模板，按分析数据占位符拆成 (头部, 尾部) 两段"""
+    if getattr(sys, 'frozen', False):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    template = Path(base_path, REPORT_TEMPLATE_FILE).read_text(encoding='utf-8')
+    head, tail = template.split('__DATA__')
+    return head, tail
+
+
+def histogram_chart(counts, edges):
+    """分布图数据：区间标签（取整）与频次"""
+    edges = edges.tolist()
+    return {'labels': [f'{lo:.0f}-{hi:.0f}' for lo, hi in zip(edges[:-1], edges[1:])],
+            'counts': counts.astype(np.int64)}
+
+
+def quantize_chart_data(chart_data):
+    """按 CHART_DECIMALS 截短图表曲线的小数位，返回新的 chart_data（不修改缓存的分析结果）"""
+    def rounded(values, decimals):
+        values = np.round(values, decimals)
+        # 不含 NaN 的取整曲线转为整数，输出时不带 .0
+        if decimals == 0 and not np.isnan(values).any():
+            return values.astype(np.int32)
+        return values
+
+    quantized = dict(chart_data)
+    for key, decimals in CHART_DECIMALS.items():
+        if key in chart_data:
+            values = rounded(chart_data[key], decimals)
+            # 取整后落在 uint16 范围内的曲线（内存 MB、Draw Calls）以小端 uint16 的 base64 嵌入，页面解码为 Uint16Array
+            if values.dtype == np.int32 and values.size and 0 <= values.min() and values.max() <= 0xFFFF:
+                values = {'u16': base64.b64encode(values.astype('<u2').tobytes()).decode('ascii')}
+            quantized[key] = values
+    if 'fps_anomaly' in chart_data:
+        quantized['fps_anomaly'] = {'x': rounded(chart_data['fps_anomaly']['x'], CHART_DECIMALS['timestamps']),
+                                    'y': rounded(chart_data['fps_anomaly']['y'], CHART_DECIMALS['fps'])}
+    return quantized
+
+
+def minmax_bucket_indices(pos, y, n_buckets, lo, hi):
+    """把升序的 pos 按 [lo, hi) 等宽分成 n_buckets 个桶，返回每桶 y 最小、最大点的下标（升序）"""
+    buckets = (pos - lo) * n_buckets // max(1, hi - lo)
+    # 桶内按 y 排序（稳定排序，y 相同时保持行序），每组首尾即该桶的最小、最大点
+    order = np.lexsort((y, buckets))
+    first = np.flatnonzero(np.diff(buckets[order], prepend=-1))
+    last = np.append(first[1:], len(order)) - 1
+    return np.unique(np.concatenate((order[first], order[last])))
+
+
+def minmax_lttb_indices(x, y, n_out, ratio=CHART_MINMAX_RATIO):
+    """MinMax-LTTB 抽稀：先按等宽桶取极值预选候选点，再用 LTTB 三角形面积选出 n_out 个点，返回下标"""
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+
+    # 预选：首尾之外的点分成 n_out * ratio / 2 个桶，每桶保留最小、最大值（末桶用末点补齐）
+    if n > n_out * ratio:
+        nb = n_out * ratio // 2
+        width = -(-(n - 2) // nb)
+        body = np.pad(y[1:n - 1], (0, nb * width - (n - 2)), mode='edge').reshape(nb, width)
+        pairs = np.sort(np.column_stack((body.argmin(axis=1), body.argmax(axis=1))), axis=1)
+        pairs = np.minimum(pairs + 1 + np.arange(nb)[:, None] * width, n - 2)
+        cand = np.unique(np.concatenate(([0], pairs.ravel(), [n - 1])))
+    else:
+        cand = np.arange(n)
+
+    # LTTB：首尾固定，中间候选点分成 n_out - 2 个桶，每桶取与上一选中点、下一桶均值点构成面积最大的点
+    xs = x[cand].astype(np.float64)
+    ys = y[cand].astype(np.float64)
+    m = len(cand)
+    edges = np.linspace(1, m - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(xs[:m - 1], edges[:-1]) / counts, xs[-1]).tolist()
+    avg_y = np.append(np.add.reduceat(ys[:m - 1], edges[:-1]) / counts, ys[-1]).tolist()
+    edges = edges.tolist()
+    xs = xs.tolist()
+    ys = ys.tolist()
+
+    picked = [0]
+    a = 0
+    for i in range(n_out - 2):
+        ax, ay = xs[a], ys[a]
+        bx, by = avg_x[i + 1], avg_y[i + 1]
+        best_area = -1.0
+        for j in range(edges[i], edges[i + 1]):
+            area = abs((ax - bx) * (ys[j] - ay) - (ax - xs[j]) * (by - ay))
+            if area > best_area:
+                best_area, a = area, j
+        picked.append(a)
+    picked.append(m - 1)
+    return cand[picked]
+
+
+def asap_window(y):
+    """ASAP 平滑窗口：峰度不低于原序列（保留异常的显著程度）的前提下，取滑动平均粗糙度（差分标准差）最小的窗口"""
+    y = y[~np.isnan(y)].astype(np.float64)
+    if len(y) < 10:
+        return 1
+
+    def kurtosis(v):
+        d = v - v.mean()
+        var = np.mean(d * d)
+        return np.mean(d ** 4) / (var * var) if var > 0 else np.nan
+
+    csum = np.concatenate(([0.0], np.cumsum(y)))
+    min_kurt = kurtosis(y)
+    best_w, best_rough = 1, np.std(np.diff(y))
+    for w in range(2, len(y) // 10 + 1):
+        sma = (csum[w:] - csum[:-w]) / w
+        if not kurtosis(sma) >= min_kurt:
+            continue
+        rough = np.std(np.diff(sma))
+        if rough < best_rough:
+            best_w, best_rough = w, rough
+    return best_w
+
+
+class _RunningStats:
+    """分批合并的计数/均值/方差/极值（Chan 并行 Welford 合并）"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.first = None
+        self.last = None
+
+    def update(self, values):
+        if HAS_NUMBA:
+            # 单次遍历同时得到计数/和/平方和/极值/首尾值
+            n, batch_sum, sq, lo, hi, first, last = moments_kernel(values)
+            n = int(n)
+            if n == 0:
+                return
+            mean = batch_sum / n
+            m2 = max(sq - batch_sum * mean, 0.0)
+        else:
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                return
+            n = values.size
+            batch_sum = float(values.sum())
+            mean = batch_sum / n
+            m2 = float(np.square(values - mean).sum())
+            lo, hi = float(values.min()), float(values.max())
+            first, last = float(values[0]), float(values[-1])
+
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        self.sum += batch_sum
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+        if self.first is None:
+            self.first = first
+        self.last = last
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else 0.0
+
 
 class InteractivePerformanceAnalyzer:
     """交互式性能分析器"""
@@ -21,28 +384,135 @@ class InteractivePerformanceAnalyzer:
         self.csv_file = csv_file
         self.platform = platform
         self.df = None
+        self.streaming = False
         self.results = {}
+        # 数值列的 NumPy 视图，每次分析只取一次
+        self._np = {}
+        # 趋势拟合结果缓存，键为 (列名, 行数)
+        self._trend_cache = {}
+        # 异常帧掩码及检测方式，异常统计与图表标注共用
+        self._anomaly_mask = None
+        self._anomaly_method = 'auto'
+        # 采集时长（秒），汇总与内存增长率共用
+        self._duration = 0.0
+
+    def run_analysis(self):
+        """加载并分析数据；CSV路径/修改时间/大小/平台均未变化时直接复用上次的结果"""
+        key = (f"{RESULTS_CACHE_VERSION}:{os.path.abspath(self.csv_file)}:"
+               f"{os.path.getmtime(self.csv_file)}:{os.path.getsize(self.csv_file)}:{self.platform}")
+        cache_path = RESULTS_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.pkl"
+
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    self.results = pickle.load(f)
+                print(f"✓ 使用缓存的分析结果: {cache_path}")
+                return
+            except Exception:
+                # 缓存文件损坏或截断时 pickle 可能抛出任意异常，统一回退为重新分析
+                print("⚠ 分析缓存已损坏，重新分析")
+
+        self.load_data()
+        self.analyze()
+
+        RESULTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump(self.results, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def load_data(self):
         """加载CSV数据"""
         print(f"正在加载数据: {self.csv_file}")
-        self.df = pd.read_csv(self.csv_file)
-
-        print(f"✓ 加载完成: {len(self.df)} 条记录")
-        print(f"✓ 检测到列: {list(self.df.columns)}")
+        if os.path.getsize(self.csv_file) > STREAMING_MIN_BYTES:
+            self.streaming = True
+            print(f"✓ 文件超过 {STREAMING_MIN_BYTES // (1024 * 1024)}MB，改为分批流式分析")
+            return
+
+        if HAS_POLARS:
+            present, overrides, casts = self._polars_columns()
+            df = pl.read_csv(self.csv_file, columns=present, schema_overrides=overrides,
+                             low_memory=True).with_columns(casts)
+            print(f"✓ 加载完成: {df.height} 条记录")
+            print(f"✓ 检测到列: {df.columns}")
+
+            # 数据清洗：在 polars 中一次过滤后再转换，避免 pandas 两次布尔掩码复制
+            if 'FPS' in df.columns:
+                df = df.filter(pl.col('FPS').is_between(0, 1000, closed='none'))
+            self.df = df.to_pandas()
+        else:
+            self.df = pd.read_csv(self.csv_file, usecols=lambda c: c in USED_COLS,
+                                  dtype={col: np.float32 for col in FLOAT32_COLS})
+            for col in INT32_COLS:
+                if col in self.df.columns and self.df[col].dtype.kind == 'i':
+                    self.df[col] = self.df[col].astype(np.int32)
+            print(f"✓ 加载完成: {len(self.df)} 条记录")
+            print(f"✓ 检测到列: {list(self.df.columns)}")
+
+            # 数据清洗
+            if 'FPS' in self.df.columns:
+                self.df = self.df[(self.df['FPS'] > 0) & (self.df['FPS'] < 1000)]
 
-        # 数据清洗
         if 'FPS' in self.df.columns:
-            self.df = self.df[self.df['FPS'] > 0]
-            self.df = self.df[self.df['FPS'] < 1000]
             print(f"✓ 清洗后记录数: {len(self.df)}")
         else:
             print("⚠ 警告: 未找到FPS列")
 
+    def _polars_columns(self):
+        """CSV中实际存在的分析列、其 polars 类型，以及整数计数列降为 Int32 的转换表达式"""
+        schema = pl.scan_csv(self.csv_file).collect_schema()
+        present = [c for c in schema.names() if c in USED_COLS]
+        casts = [pl.col(c).cast(pl.Int32, strict=False) for c in INT32_COLS
+                 if c in present and schema[c].is_integer()]
+        return present, {c: SCHEMA[c] for c in present if c in SCHEMA}, casts
+
+    def _iter_batches(self):
+        """分批读取CSV（只含分析列，已做FPS清洗）"""
+        if HAS_POLARS:
+            present, overrides, casts = self._polars_columns()
+            lf = (pl.scan_csv(self.csv_file, schema_overrides=overrides, low_memory=True)
+                  .select(present).with_columns(casts))
+            if 'FPS' in present:
+                lf = lf.filter(pl.col('FPS').is_between(0, 1000, closed='none'))
+            for batch in lf.collect_batches(chunk_size=STREAM_BATCH_ROWS):
+                yield batch.to_pandas()
+        else:
+            for batch in pd.read_csv(self.csv_file, usecols=lambda c: c in USED_COLS,
+                                     chunksize=STREAM_BATCH_ROWS):
+                if 'FPS' in batch.columns:
+                    batch = batch[(batch['FPS'] > 0) & (batch['FPS'] < 1000)]
+                yield batch
+
     def analyze(self):
         """执行完整分析"""
         print("正在分析数据...")
 
+        if self.streaming:
+            self.results = self._analyze_streaming()
+        else:
+            self._analyze_in_memory()
+
+        metrics = Metrics(
+            fps_mean=self.results['fps'].get('mean', 60),
+            mem_max=self.results['memory'].get('max', 0),
+            gc_mean=self.results['gc'].get('mean', 0)
+        )
+        if self.platform != 'PC':
+            self.results['mobile_predictions'] = self._predict_mobile(metrics)
+
+        self.results['performance_score'] = self._calculate_score(metrics)
+        self.results['issues'] = self._detect_issues(metrics)
+        self.results['recommendations'] = self._generate_recommendations()
+        self.results['metric_cards'] = self._metric_cards()
+
+        print("✓ 分析完成")
+
+    def _analyze_in_memory(self):
+        """整表载入时的逐项分析"""
+        self._np = {col: self.df[col].to_numpy() for col in self.df.select_dtypes('number').columns}
+        self._trend_cache.clear()
+        ts = self._np.get('Timestamp')
+        self._duration = float(ts[-1] - ts[0]) if ts is not None and ts.size > 1 else 0.0
+        self._anomaly_mask, self._anomaly_method = self._compute_anomaly_mask()
+
         self.results = {
             'metadata': self._analyze_metadata(),
             'summary': self._analyze_summary(),
@@ -60,14 +530,241 @@ class InteractivePerformanceAnalyzer:
             'chart_data': self._prepare_chart_data()
         }
 
-        if self.platform != 'PC':
-            self.results['mobile_predictions'] = self._predict_mobile()
+    def _analyze_streaming(self):
+        """超大CSV分批统计：精确的计数/均值/极值与图表极值点，部分分位数、相关性与趋势线取自蓄水池抽样"""
+        rng = np.random.default_rng(0)
+        stats = {col: _RunningStats() for col in STREAM_STAT_COLS}
+        columns = None
+        n = 0
+        prev_fps = np.nan
+        first_ts = last_ts = None
+        anomaly_count = gc_spikes = cpu_wins = gpu_wins = 0
+        detection_method = 'auto'
+        gpu_col = None
+        # 趋势斜率所需的 Σy 与 Σxy（x 为全局行号）
+        trend_sums = {'FPS': [0.0, 0.0], 'TotalAllocated_MB': [0.0, 0.0]}
+        scene_counts, scene_sums = {}, {}
+        fps_hist = np.zeros(FPS_HIST_BINS, dtype=np.int64)
+        sample_keys = np.empty(0)
+        sample = {}
+        # 图表候选点（全部行的逐桶FPS极值）与异常帧标记（超过上限后每 anomaly_step 个取一个）
+        chart = {}
+        anomaly_x, anomaly_y = np.empty(0), np.empty(0, dtype=np.float32)
+        anomaly_step = 1
+
+        for batch in self._iter_batches():
+            if columns is None:
+                columns = list(batch.columns)
+                gpu_col = next((c for c in ['GPUFrameTime_ms', 'GPU_ms', 'GPUTime_ms'] if c in columns), None)
+            if len(batch) == 0:
+                continue
 
-        self.results['performance_score'] = self._calculate_score()
-        self.results['issues'] = self._detect_issues()
-        self.results['recommendations'] = self._generate_recommendations()
+            rows = np.arange(n, n + len(batch))
+            for col, stat in stats.items():
+                if col in batch.columns:
+                    stat.update(batch[col].to_numpy(dtype=np.float64))
+
+            for col, sums in trend_sums.items():
+                if col in batch.columns:
+                    y = batch[col].to_numpy(dtype=np.float64)
+                    sums[0] += float(y.sum())
+                    sums[1] += float(np.dot(rows, y))
+
+            if 'Timestamp' in batch.columns:
+                ts = batch['Timestamp'].to_numpy()
+                if first_ts is None:
+                    first_ts = float(ts[0])
+                last_ts = float(ts[-1])
+
+            if 'FPS' in batch.columns:
+                fps_bins = np.rint(batch['FPS'].to_numpy() * FPS_HIST_SCALE).astype(np.intp)
+                fps_hist += np.bincount(fps_bins, minlength=FPS_HIST_BINS)
+
+            x = batch['Timestamp'].to_numpy() if 'Timestamp' in batch.columns else rows
+            mask, detection_method = anomaly_mask(batch, prev_fps)
+            if 'FPS' in batch.columns:
+                hits = np.flatnonzero(mask)
+                hits = hits[(anomaly_count + np.arange(hits.size)) % anomaly_step == 0]
+                anomaly_x = np.concatenate([anomaly_x, x[hits]])
+                anomaly_y = np.concatenate([anomaly_y, batch['FPS'].to_numpy()[hits]])
+                if anomaly_x.size > STREAM_ANOMALY_MAX_POINTS:
+                    anomaly_x, anomaly_y = anomaly_x[::2], anomaly_y[::2]
+                    anomaly_step *= 2
+                prev_fps = float(batch['FPS'].iloc[-1])
+            anomaly_count += int(np.count_nonzero(mask))
+
+            if 'GCAllocThisFrame_KB' in batch.columns:
+                gc_spikes += int(np.count_nonzero(batch['GCAllocThisFrame_KB'].to_numpy() > GC_SPIKE_KB))
+
+            if 'CPUFrameTime_ms' in batch.columns and gpu_col:
+                diff = batch['CPUFrameTime_ms'].to_numpy() - batch[gpu_col].to_numpy()
+                cpu_wins += int(np.count_nonzero(diff > 0))
+                gpu_wins += int(np.count_nonzero(diff < 0))
+
+            if 'CurrentSceneName' in batch.columns and 'FPS' in batch.columns:
+                grouped = batch.groupby('CurrentSceneName', sort=False)['FPS'].agg(['size', 'sum'])
+                for scene, count, fps_sum in zip(grouped.index, grouped['size'], grouped['sum']):
+                    scene_counts[scene] = scene_counts.get(scene, 0) + int(count)
+                    scene_sums[scene] = scene_sums.get(scene, 0.0) + float(fps_sum)
+
+            # 蓄水池抽样：保留随机键最小的 STREAM_SAMPLE_SIZE 行
+            keys = rng.random(len(batch))
+            picked = np.arange(len(batch))
+            if len(batch) > STREAM_SAMPLE_SIZE:
+                picked = np.argpartition(keys, STREAM_SAMPLE_SIZE)[:STREAM_SAMPLE_SIZE]
+            batch_sample = {col: batch[col].to_numpy()[picked] for col in batch.columns
+                            if col != 'CurrentSceneName' and col not in ANOMALY_COLS}
+            batch_sample['_row'] = rows[picked]
+            sample_keys = np.concatenate([sample_keys, keys[picked]])
+            sample = {col: np.concatenate([sample[col], values]) if col in sample else values
+                      for col, values in batch_sample.items()}
+            if sample_keys.size > STREAM_SAMPLE_SIZE:
+                keep = np.argpartition(sample_keys, STREAM_SAMPLE_SIZE)[:STREAM_SAMPLE_SIZE]
+                sample_keys = sample_keys[keep]
+                sample = {col: values[keep] for col, values in sample.items()}
+
+            # 图表候选点：本批按行号等宽分桶保留FPS极值行，累计过多时在已读行号范围上合并成更粗的桶
+            fps_values = batch['FPS'].to_numpy() if 'FPS' in batch.columns else np.zeros(len(batch))
+            picked = minmax_bucket_indices(rows, fps_values, STREAM_CHART_BUCKETS, n, n + len(batch))
+            batch_chart = {col: batch[col].to_numpy()[picked] for col in batch_sample if col != '_row'}
+            batch_chart['_row'] = rows[picked]
+            chart = {col: np.concatenate([chart[col], values]) if col in chart else values
+                     for col, values in batch_chart.items()}
+            if chart['_row'].size > 4 * STREAM_CHART_BUCKETS:
+                chart = self._reduce_chart_candidates(chart, n + len(batch))
+
+            n += len(batch)
+            print(f"  已处理 {n} 条记录")
+
+        columns = columns or []
+        order = np.argsort(sample.get('_row', np.empty(0, dtype=np.int64)))
+        sample = {col: values[order] for col, values in sample.items()}
+        duration = last_ts - first_ts if first_ts is not None and n > 1 else 0
+
+        results = {
+            'metadata': {
+                'file_name': os.path.basename(self.csv_file),
+                'platform': self.platform,
+                'record_count': n,
+                'columns': columns
+            },
+            'summary': {
+                'duration_seconds': float(duration),
+                'duration_minutes': float(duration / 60) if duration > 0 else 0,
+                'total_samples': n,
+                'sample_rate': float(duration / n) if n > 1 else 0.5
+            },
+            'fps': {'mean': 0, 'median': 0, 'min': 0, 'max': 0, 'std': 0, 'cv': 0,
+                    'p1': 0, 'p5': 0, 'p25': 0, 'p75': 0, 'p95': 0, 'p99': 0},
+            'memory': {},
+            'gc': {},
+            'rendering': {},
+            'cpu': {},
+            'anomalies': {
+                'count': anomaly_count,
+                'rate': float(anomaly_count / n) if n > 0 else 0,
+                'detection_method': detection_method
+            },
+            'scenes': {scene: {'count': count, 'avg_fps': scene_sums[scene] / count}
+                       for scene, count in scene_counts.items() if not pd.isna(scene)},
+            'correlations': {},
+            'trends': {},
+            'bottleneck': {},
+            'mobile_predictions': None,
+            'chart_data': {}
+        }
 
-        print("✓ 分析完成")
+        fps = stats['FPS']
+        if fps.n:
+            p1, p5, p25, median, p75, p95, p99 = histogram_quantiles(
+                fps_hist, [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99], FPS_HIST_SCALE)
+            results['fps'] = {
+                'mean': fps.mean, 'median': median, 'min': fps.min, 'max': fps.max, 'std': fps.std,
+                'cv': fps.std / fps.mean if fps.mean > 0 else 0,
+                'p1': p1, 'p5': p5, 'p25': p25, 'p75': p75, 'p95': p95, 'p99': p99
+            }
+
+        mem = stats['TotalAllocated_MB']
+        if mem.n:
+            results['memory'] = {
+                'mean': mem.mean, 'min': mem.min, 'max': mem.max,
+                'growth': mem.last - mem.first,
+                'growth_rate': (mem.last - mem.first) / max(1, duration)
+            }
+
+        gc = stats['GCAllocThisFrame_KB']
+        if gc.n:
+            results['gc'] = {
+                'mean': gc.mean, 'median': float(np.nanmedian(sample['GCAllocThisFrame_KB'])),
+                'max': gc.max, 'total': gc.sum,
+                'spike_count': gc_spikes, 'spike_rate': gc_spikes / n
+            }
+
+        if stats['DrawCalls'].n:
+            results['rendering']['draw_calls_mean'] = stats['DrawCalls'].mean
+            results['rendering']['draw_calls_max'] = stats['DrawCalls'].max
+        if stats['Triangles'].n:
+            results['rendering']['triangles_mean'] = stats['Triangles'].mean
+
+        cpu = stats['CPUFrameTime_ms']
+        if cpu.n:
+            median, p95, p99 = np.nanquantile(sample['CPUFrameTime_ms'], [0.5, 0.95, 0.99]).tolist()
+            results['cpu'] = {'mean': cpu.mean, 'median': median, 'max': cpu.max, 'p95': p95, 'p99': p99}
+
+        results['correlations'] = correlation_dict(sample)
+
+        # x = 0..n-1 时 Σx 与 Σ(x-x̄)² 都有闭式解
+        for key, col in [('fps', 'FPS'), ('memory', 'TotalAllocated_MB')]:
+            if col in columns:
+                if n < 2:
+                    results['trends'][key] = {'slope': 0, 'trend_type': 'stable'}
+                    continue
+                sum_y, sum_xy = trend_sums[col]
+                slope = (sum_xy - (n - 1) / 2 * sum_y) / (n * (n * n - 1) / 12)
+                results['trends'][key] = {'slope': slope, 'trend_type': self._trend_type(slope)}
+
+        if 'CPUFrameTime_ms' in columns and gpu_col and n:
+            results['bottleneck'] = {
+                'cpu_bottleneck_rate': cpu_wins / n,
+                'gpu_bottleneck_rate': gpu_wins / n,
+                'dominant_bottleneck': 'CPU' if cpu_wins > gpu_wins else 'GPU' if gpu_wins > cpu_wins else 'Balanced'
+            }
+
+        # FPS分布图基于全部数据：0.01 精度直方图按实际取值范围合并成分布图区间
+        if fps.n:
+            nonzero = np.flatnonzero(fps_hist)
+            counts, edges = np.histogram(np.arange(FPS_HIST_BINS) / FPS_HIST_SCALE, bins=FPS_DIST_BINS,
+                                         range=(nonzero[0] / FPS_HIST_SCALE, nonzero[-1] / FPS_HIST_SCALE),
+                                         weights=fps_hist)
+            results['chart_data']['fps_hist'] = histogram_chart(counts, edges)
+
+        # 曲线取自全部行的逐桶FPS极值候选点，尖峰与掉帧不会因抽样丢失；趋势线需要均匀样本，取自蓄水池抽样
+        if chart:
+            chart = self._reduce_chart_candidates(chart, n)
+            chart_data = results['chart_data']
+            x = chart['Timestamp'] if 'Timestamp' in chart else chart['_row']
+            idx = self._chart_indices(x, chart.get('FPS'))
+            chart_data['timestamps'] = x[idx]
+            if 'FPS' in chart:
+                chart_data['fps'] = chart['FPS'][idx]
+                nearest = np.searchsorted(sample['_row'], chart['_row'][idx]).clip(max=sample['_row'].size - 1)
+                chart_data['fps_trend'] = self._fps_trend(sample['FPS'], nearest)
+                chart_data['fps_anomaly'] = {'x': anomaly_x, 'y': anomaly_y}
+            for col, key in CHART_COLS.items():
+                if col in chart:
+                    chart_data[key] = chart[col][idx]
+            for col in ['GPUFrameTime_ms', 'GPU_ms']:
+                if col in chart:
+                    chart_data['gpu_time'] = chart[col][idx]
+                    break
+
+        return results
+
+    def _reduce_chart_candidates(self, chart, n):
+        """把流式图表候选点在行号 [0, n) 上重新等宽分桶，每桶只留FPS最小、最大两行"""
+        fps = chart['FPS'] if 'FPS' in chart else np.zeros(chart['_row'].size)
+        keep = minmax_bucket_indices(chart['_row'], fps, STREAM_CHART_BUCKETS, 0, n)
+        return {col: values[keep] for col, values in chart.items()}
 
     def _analyze_metadata(self):
         """元数据分析"""
@@ -80,10 +777,7 @@ class InteractivePerformanceAnalyzer:
 
     def _analyze_summary(self):
         """汇总统计"""
-        duration = 0
-        if 'Timestamp' in self.df.columns and len(self.df) > 1:
-            duration = self.df['Timestamp'].iloc[-1] - self.df['Timestamp'].iloc[0]
-
+        duration = self._duration
         return {
             'duration_seconds': float(duration),
             'duration_minutes': float(duration / 60) if duration > 0 else 0,
@@ -93,24 +787,29 @@ class InteractivePerformanceAnalyzer:
 
     def _analyze_fps(self):
         """FPS分析"""
-        if 'FPS' not in self.df.columns:
+        if 'FPS' not in self.df.columns or self.df.empty:
             return {'mean': 0, 'median': 0, 'min': 0, 'max': 0, 'std': 0, 'cv': 0,
                     'p1': 0, 'p5': 0, 'p25': 0, 'p75': 0, 'p95': 0, 'p99': 0}
 
-        fps = self.df['FPS']
+        # 清洗后FPS无缺失值：一次 np.quantile 求全部分位数，其余统计直接在数组上做
+        fps = self._np['FPS']
+        p1, p5, p25, median, p75, p95, p99 = np.quantile(
+            fps, [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]).tolist()
+        mean = float(fps.mean())
+        std = float(fps.std(ddof=1))
         return {
-            'mean': float(fps.mean()),
-            'median': float(fps.median()),
+            'mean': mean,
+            'median': median,
             'min': float(fps.min()),
             'max': float(fps.max()),
-            'std': float(fps.std()),
-            'cv': float(fps.std() / fps.mean()) if fps.mean() > 0 else 0,
-            'p1': float(fps.quantile(0.01)),
-            'p5': float(fps.quantile(0.05)),
-            'p25': float(fps.quantile(0.25)),
-            'p75': float(fps.quantile(0.75)),
-            'p95': float(fps.quantile(0.95)),
-            'p99': float(fps.quantile(0.99))
+            'std': std,
+            'cv': std / mean if mean > 0 else 0,
+            'p1': p1,
+            'p5': p5,
+            'p25': p25,
+            'p75': p75,
+            'p95': p95,
+            'p99': p99
         }
 
     def _analyze_memory(self):
@@ -118,17 +817,18 @@ class InteractivePerformanceAnalyzer:
         if 'TotalAllocated_MB' not in self.df.columns:
             return {}
 
-        mem = self.df['TotalAllocated_MB']
-        duration = 1
-        if 'Timestamp' in self.df.columns and len(self.df) > 1:
-            duration = max(1, self.df['Timestamp'].iloc[-1] - self.df['Timestamp'].iloc[0])
+        mem = self._np['TotalAllocated_MB']
+        mem = mem[~np.isnan(mem)]
+        if mem.size == 0:
+            return {}
 
+        duration = max(1, self._duration)
         return {
             'mean': float(mem.mean()),
             'min': float(mem.min()),
             'max': float(mem.max()),
-            'growth': float(mem.iloc[-1] - mem.iloc[0]),
-            'growth_rate': float((mem.iloc[-1] - mem.iloc[0]) / duration)
+            'growth': float(mem[-1] - mem[0]),
+            'growth_rate': float((mem[-1] - mem[0]) / duration)
         }
 
     def _analyze_gc(self):
@@ -136,14 +836,22 @@ class InteractivePerformanceAnalyzer:
         if 'GCAllocThisFrame_KB' not in self.df.columns:
             return {}
 
-        gc = self.df['GCAllocThisFrame_KB']
+        gc = self._np['GCAllocThisFrame_KB']
+        rows = len(gc)
+        gc = gc[~np.isnan(gc)]
+        if gc.size == 0:
+            return {}
+
+        # 总量只求一次并复用于均值，尖峰只比较一次
+        total = float(gc.sum())
+        spike_count = int(np.count_nonzero(gc > GC_SPIKE_KB))
         return {
-            'mean': float(gc.mean()),
-            'median': float(gc.median()),
+            'mean': total / gc.size,
+            'median': float(np.median(gc)),
             'max': float(gc.max()),
-            'total': float(gc.sum()),
-            'spike_count': int((gc > 500).sum()),
-            'spike_rate': float((gc > 500).sum() / len(gc)) if len(gc) > 0 else 0
+            'total': total,
+            'spike_count': spike_count,
+            'spike_rate': spike_count / rows
         }
 
     def _analyze_rendering(self):
@@ -161,137 +869,109 @@ class InteractivePerformanceAnalyzer:
         if 'CPUFrameTime_ms' not in self.df.columns:
             return {}
 
-        cpu = self.df['CPUFrameTime_ms']
+        cpu = self._np['CPUFrameTime_ms']
+        cpu = cpu[~np.isnan(cpu)]
+        if cpu.size == 0:
+            return {}
+
+        median, p95, p99 = np.quantile(cpu, [0.5, 0.95, 0.99]).tolist()
         return {
             'mean': float(cpu.mean()),
-            'median': float(cpu.median()),
+            'median': median,
             'max': float(cpu.max()),
-            'p95': float(cpu.quantile(0.95)),
-            'p99': float(cpu.quantile(0.99))
+            'p95': p95,
+            'p99': p99
         }
 
+    def _compute_anomaly_mask(self):
+        """识别异常列并计算一次异常帧掩码，返回 (mask, 检测方式)"""
+        mask, method = anomaly_mask(self.df)
+        if method == 'auto' and 'FPS' in self.df.columns:
+            print(f"⚠ 未找到异常标记列，基于FPS自动检测到 {np.count_nonzero(mask)} 个异常帧")
+        return mask, method
+
     def _analyze_anomalies(self):
         """异常分析 - 增强版"""
-        anomaly_count = 0
-
-        # 尝试多种可能的列名
-        possible_columns = ['IsAnomaly', '是否异常', 'Anomaly', 'isAnomaly']
-        anomaly_column = None
-
-        for col in possible_columns:
-            if col in self.df.columns:
-                anomaly_column = col
-                break
-
-        if anomaly_column:
-            # 处理不同的数据类型
-            if self.df[anomaly_column].dtype == bool:
-                anomaly_count = int(self.df[anomaly_column].sum())
-            elif self.df[anomaly_column].dtype in ['int64', 'int32']:
-                anomaly_count = int((self.df[anomaly_column] == 1).sum())
-            else:
-                # 字符串类型：'是', 'True', '1'等
-                anomaly_count = int(self.df[anomaly_column].isin(['是', 'True', '1', 1, True]).sum())
-        else:
-            # 如果没有异常列，基于FPS自动判断
-            if 'FPS' in self.df.columns:
-                # FPS < 30 或者突降超过20 FPS
-                fps = self.df['FPS']
-                low_fps = fps < 30
-
-                # 计算FPS骤降
-                fps_drop = fps.diff() < -20
-
-                anomaly_count = int((low_fps | fps_drop).sum())
-                print(f"⚠ 未找到异常标记列，基于FPS自动检测到 {anomaly_count} 个异常帧")
-
         return {
-            'count': anomaly_count,
-            'rate': float(anomaly_count / len(self.df)) if len(self.df) > 0 else 0,
-            'detection_method': 'manual' if anomaly_column else 'auto'
+            'count': int(np.count_nonzero(self._anomaly_mask)),
+            'rate': float(self._anomaly_mask.mean()) if self._anomaly_mask.size > 0 else 0,
+            'detection_method': self._anomaly_method
         }
 
     def _analyze_scenes(self):
         """场景分析"""
-        if 'CurrentSceneName' not in self.df.columns:
+        if 'CurrentSceneName' not in self.df.columns or 'FPS' not in self.df.columns:
             return {}
 
-        scenes = {}
-        for scene in self.df['CurrentSceneName'].unique():
-            if pd.isna(scene):
-                continue
-            scene_data = self.df[self.df['CurrentSceneName'] == scene]
-            if 'FPS' in scene_data.columns:
-                scenes[scene] = {
-                    'count': len(scene_data),
-                    'avg_fps': float(scene_data['FPS'].mean())
-                }
-        return scenes
+        # 一次 groupby 聚合所有场景（保持首次出现顺序，自动跳过空场景名）
+        grouped = self.df.groupby('CurrentSceneName', sort=False)['FPS'].agg(['size', 'mean'])
+        return {
+            scene: {'count': int(count), 'avg_fps': float(avg_fps)}
+            for scene, count, avg_fps in zip(grouped.index, grouped['size'], grouped['mean'])
+        }
 
     def _analyze_correlations(self):
         """相关性分析"""
-        numeric_cols = ['FPS']
-        for col in ['TotalAllocated_MB', 'GCAllocThisFrame_KB', 'DrawCalls', 'CPUFrameTime_ms']:
-            if col in self.df.columns:
-                numeric_cols.append(col)
-
-        if len(numeric_cols) < 2:
-            return {}
-
-        corr_matrix = self.df[numeric_cols].corr()
-        return corr_matrix.to_dict()
+        return correlation_dict(self._np)
 
     def _analyze_trends(self):
         """趋势分析"""
         results = {}
 
-        if 'FPS' in self.df.columns:
-            fps_data = self.df['FPS'].values
-            results['fps'] = self._analyze_single_trend(fps_data)
+        if 'FPS' in self._np:
+            results['fps'] = self._analyze_single_trend('FPS')
 
-        if 'TotalAllocated_MB' in self.df.columns:
-            mem_data = self.df['TotalAllocated_MB'].values
-            results['memory'] = self._analyze_single_trend(mem_data)
+        if 'TotalAllocated_MB' in self._np:
+            results['memory'] = self._analyze_single_trend('TotalAllocated_MB')
 
         return results
 
-    def _analyze_single_trend(self, data):
+    def _analyze_single_trend(self, col_name):
         """单个指标趋势"""
+        data = self._np[col_name]
+        key = (col_name, len(data))
+        if key in self._trend_cache:
+            return self._trend_cache[key]
+
         if len(data) < 2:
-            return {'slope': 0, 'trend_type': 'stable'}
+            trend = {'slope': 0, 'trend_type': 'stable'}
+        else:
+            # x = 0..n-1 时一次拟合斜率的闭式解，与流式分析一致，省去 polyfit 的最小二乘求解
+            n = len(data)
+            slope = float(np.dot(np.arange(n) - (n - 1) / 2, data) / (n * (n * n - 1) / 12))
+            trend = {'slope': slope, 'trend_type': self._trend_type(slope)}
 
-        x = np.arange(len(data))
-        slope = float(np.polyfit(x, data, 1)[0])
+        self._trend_cache[key] = trend
+        return trend
 
+    @staticmethod
+    def _trend_type(slope):
+        """斜率对应的趋势类型"""
         if abs(slope) < 0.001:
-            trend_type = 'stable'
+            return 'stable'
         elif slope > 0:
-            trend_type = 'increasing'
-        else:
-            trend_type = 'decreasing'
-
-        return {'slope': slope, 'trend_type': trend_type}
+            return 'increasing'
+        return 'decreasing'
 
     def _analyze_bottleneck(self):
         """瓶颈分析"""
-        if 'CPUFrameTime_ms' not in self.df.columns:
+        if 'CPUFrameTime_ms' not in self._np:
             return {}
 
         gpu_col = None
         for col in ['GPUFrameTime_ms', 'GPU_ms', 'GPUTime_ms']:
-            if col in self.df.columns:
+            if col in self._np:
                 gpu_col = col
                 break
 
         if gpu_col is None:
             return {}
 
-        cpu_time = self.df['CPUFrameTime_ms'].values
-        gpu_time = self.df[gpu_col].values
-
-        cpu_bottleneck = np.sum(cpu_time > gpu_time)
-        gpu_bottleneck = np.sum(gpu_time > cpu_time)
-        total = len(cpu_time)
+        # 只遍历一次两列生成差值，再在同一临时数组上计数（NaN 两边都不计）
+        diff = self._np['CPUFrameTime_ms'] - self._np[gpu_col]
+        cpu_bottleneck = np.count_nonzero(diff > 0)
+        gpu_bottleneck = np.count_nonzero(diff < 0)
+        total = len(diff)
 
         return {
             'cpu_bottleneck_rate': float(cpu_bottleneck / total),
@@ -299,79 +979,129 @@ class InteractivePerformanceAnalyzer:
             'dominant_bottleneck': 'CPU' if cpu_bottleneck > gpu_bottleneck else 'GPU' if gpu_bottleneck > cpu_bottleneck else 'Balanced'
         }
 
-    def _predict_mobile(self):
+    def _predict_mobile(self, metrics):
         """移动平台预测"""
-        devices = {
-            'flagship_2024': {'name': '2024旗舰机', 'fps_ratio': 0.90, 'memory_ratio': 1.15},
-            'flagship_2022': {'name': '2022旗舰机', 'fps_ratio': 0.80, 'memory_ratio': 1.30},
-            'high_end': {'name': '高端设备', 'fps_ratio': 0.65, 'memory_ratio': 1.60},
-            'mid_range': {'name': '中端设备', 'fps_ratio': 0.50, 'memory_ratio': 2.00},
-            'low_end': {'name': '低端设备', 'fps_ratio': 0.35, 'memory_ratio': 2.80}
-        }
-
-        base_fps = self.results.get('fps', {}).get('mean', 60)
-        base_memory = self.results.get('memory', {}).get('max', 512)
+        devices = [
+            ('flagship_2024', '2024旗舰机'),
+            ('flagship_2022', '2022旗舰机'),
+            ('high_end', '高端设备'),
+            ('mid_range', '中端设备'),
+            ('low_end', '低端设备')
+        ]
+        # 每行为 (FPS比例, 内存比例)，与 devices 一一对应
+        ratios = np.array([
+            [0.90, 1.15],
+            [0.80, 1.30],
+            [0.65, 1.60],
+            [0.50, 2.00],
+            [0.35, 2.80]
+        ])
+
+        base = np.array([metrics.fps_mean, metrics.mem_max or 512])
+        preds = ratios * base
 
         predictions = {}
-        for key, device in devices.items():
-            pred_fps = base_fps * device['fps_ratio']
-            pred_memory = base_memory * device['memory_ratio']
-
+        for (key, name), (pred_fps, pred_memory) in zip(devices, preds.tolist()):
             predictions[key] = {
-                'name': device['name'],
-                'predicted_fps': float(pred_fps),
-                'predicted_memory': float(pred_memory),
-                'playable': bool(pred_fps >= 30)
+                'name': name,
+                'predicted_fps': pred_fps,
+                'predicted_memory': pred_memory,
+                'playable': pred_fps >= 30
             }
 
         return predictions
 
-    def _calculate_score(self):
+    def _calculate_score(self, metrics):
         """计算性能评分"""
         score = 100
-        fps = self.results.get('fps', {})
-        mem = self.results.get('memory', {})
-        gc = self.results.get('gc', {})
 
-        if fps.get('mean', 60) < 60:
-            score -= (60 - fps.get('mean', 60)) * 0.5
+        if metrics.fps_mean < 60:
+            score -= (60 - metrics.fps_mean) * 0.5
 
-        if mem.get('max', 0) > 800:
-            score -= (mem.get('max', 0) - 800) * 0.05
+        if metrics.mem_max > 800:
+            score -= (metrics.mem_max - 800) * 0.05
 
-        if gc.get('mean', 0) > 100:
-            score -= (gc.get('mean', 0) - 100) * 0.1
+        if metrics.gc_mean > 100:
+            score -= (metrics.gc_mean - 100) * 0.1
 
         return max(0, min(100, float(score)))
 
-    def _detect_issues(self):
+    def _metric_cards(self):
+        """顶部指标卡片：标题、格式化后的数值与说明、状态（good/warning/bad）"""
+        fps = self.results['fps']
+        score = self.results['performance_score']
+        anomalies = self.results['anomalies']
+        anomaly_rate = anomalies['rate'] * 100
+
+        cards = [
+            {
+                'title': '性能评分',
+                'value': f"{score:.0f}",
+                'label': '/ 100',
+                'status': 'good' if score >= 80 else 'warning' if score >= 60 else 'bad'
+            },
+            {
+                'title': '平均FPS',
+                'value': f"{fps['mean']:.1f}",
+                'label': f"最低: {fps['min']:.1f}",
+                'status': 'good' if fps['mean'] >= 55 else 'warning' if fps['mean'] >= 30 else 'bad'
+            },
+            {
+                'title': 'P1低点',
+                'value': f"{fps['p1']:.1f}",
+                'label': 'FPS',
+                'status': 'good' if fps['p1'] >= 30 else 'warning' if fps['p1'] >= 20 else 'bad'
+            },
+            {
+                'title': 'FPS稳定性',
+                'value': f"{fps['cv'] * 100:.1f}",
+                'label': '%变异系数',
+                'status': 'good' if fps['cv'] < 0.15 else 'warning' if fps['cv'] < 0.25 else 'bad'
+            },
+            {
+                'title': '异常率',
+                'value': f"{anomaly_rate:.1f}",
+                'label': f"% ({anomalies['count']}次)",
+                'status': 'good' if anomaly_rate < 5 else 'warning' if anomaly_rate < 15 else 'bad'
+            }
+        ]
+
+        mem_max = self.results['memory'].get('max')
+        if mem_max:
+            cards.append({
+                'title': '内存峰值',
+                'value': f"{mem_max:.0f}",
+                'label': 'MB',
+                'status': 'good' if mem_max < 500 else 'warning' if mem_max < 800 else 'bad'
+            })
+
+        return cards
+
+    def _detect_issues(self, metrics):
         """检测问题"""
         issues = []
-        fps = self.results.get('fps', {})
 
-        if fps.get('mean', 60) < 30:
+        if metrics.fps_mean < 30:
             issues.append({
                 'severity': 'critical',
                 'category': 'FPS',
-                'description': f"平均FPS过低 ({fps.get('mean', 0):.1f})",
+                'description': f"平均FPS过低 ({metrics.fps_mean:.1f})",
                 'suggestion': '检查CPU/GPU瓶颈，优化渲染管线'
             })
 
-        mem = self.results.get('memory', {})
-        if mem.get('max', 0) > 800:
+        if metrics.mem_max > 800:
             issues.append({
                 'severity': 'critical',
                 'category': 'Memory',
-                'description': f"内存峰值过高 ({mem.get('max', 0):.0f}MB)",
+                'description': f"内存峰值过高 ({metrics.mem_max:.0f}MB)",
                 'suggestion': '检查纹理压缩、对象池使用'
             })
 
-        gc = self.results.get('gc', {})
-        if gc.get('mean', 0) > 100:
+        if metrics.gc_mean > 100:
             issues.append({
                 'severity': 'warning',
                 'category': 'GC',
-                'description': f"GC压力过大 ({gc.get('mean', 0):.0f}KB/帧)",
+                'description': f"GC压力过大 ({metrics.gc_mean:.0f}KB/帧)",
                 'suggestion': '减少装箱、字符串拼接，使用对象池'
             })
 
@@ -406,93 +1136,98 @@ class InteractivePerformanceAnalyzer:
 
         return recommendations
 
+    def _chart_indices(self, x, fps):
+        """图表抽稀下标：按FPS曲线做 MinMax-LTTB 保留尖峰与掉帧，其余曲线共用这组下标以对齐时间轴"""
+        if fps is None:
+            if len(x) <= CHART_MAX_POINTS:
+                return np.arange(len(x))
+            return np.linspace(0, len(x) - 1, CHART_MAX_POINTS).astype(np.intp)
+        return minmax_lttb_indices(x, fps, CHART_MAX_POINTS)
+
+    def _fps_trend(self, fps, idx):
+        """ASAP 平滑后的FPS趋势线，按图表抽稀下标取点"""
+        n = len(fps)
+        # 先按图表分辨率分桶求均值，在桶序列上搜索窗口，再换算成帧数
+        bucket = max(1, n // CHART_MAX_POINTS)
+        m = n // bucket
+        window = asap_window(fps[:m * bucket].reshape(m, bucket).mean(axis=1)) * bucket
+
+        # 以各抽稀点为中心的滑动平均（首尾窗口截断）
+        csum = np.concatenate(([0.0], np.cumsum(fps, dtype=np.float64)))
+        lo = np.clip(idx - window // 2, 0, n)
+        hi = np.clip(idx - window // 2 + window, 0, n)
+        return ((csum[hi] - csum[lo]) / (hi - lo)).astype(np.float32)
+
     def _prepare_chart_data(self):
         """准备图表数据 - 增强版"""
         chart_data = {}
+        cols = self._np
 
         # 时间轴
-        if 'Timestamp' in self.df.columns:
-            timestamps = self.df['Timestamp'].tolist()
-        else:
-            timestamps = list(range(len(self.df)))
-
-        chart_data['timestamps'] = timestamps
+        x = cols['Timestamp'] if 'Timestamp' in cols else np.arange(len(self.df))
+        # 各曲线保留 NumPy 数组交给 _dumps 序列化：float32 经 tolist 转 Python float 会带出 63.04999923706055 这类长尾数
+        idx = self._chart_indices(x, cols.get('FPS'))
+        chart_data['timestamps'] = x[idx]
 
         # FPS数据
-        if 'FPS' in self.df.columns:
-            chart_data['fps'] = self.df['FPS'].tolist()
-            chart_data['fps_anomaly'] = []
-
-            # 尝试多种异常列名
-            anomaly_col = None
-            for col in ['IsAnomaly', '是否异常', 'Anomaly']:
-                if col in self.df.columns:
-                    anomaly_col = col
-                    break
+        if 'FPS' in cols:
+            chart_data['fps'] = cols['FPS'][idx]
+            chart_data['fps_trend'] = self._fps_trend(cols['FPS'], idx)
+            chart_data['fps_hist'] = histogram_chart(*np.histogram(cols['FPS'], bins=FPS_DIST_BINS))
 
-            if anomaly_col:
-                # 根据数据类型过滤异常
-                if self.df[anomaly_col].dtype == bool:
-                    anomalies = self.df[self.df[anomaly_col] == True]
-                elif self.df[anomaly_col].dtype in ['int64', 'int32']:
-                    anomalies = self.df[self.df[anomaly_col] == 1]
-                else:
-                    anomalies = self.df[self.df[anomaly_col].isin(['是', 'True', '1', 1, True])]
-
-                chart_data['fps_anomaly'] = [
-                    {'x': float(row['Timestamp']) if 'Timestamp' in self.df.columns else i,
-                     'y': float(row['FPS'])}
-                    for i, row in anomalies.iterrows()
-                ]
-            else:
-                # 自动检测异常：FPS < 30 或骤降 > 20
-                fps = self.df['FPS']
-                anomaly_mask = (fps < 30) | (fps.diff() < -20)
-                anomalies = self.df[anomaly_mask]
-
-                chart_data['fps_anomaly'] = [
-                    {'x': float(row['Timestamp']) if 'Timestamp' in self.df.columns else i,
-                     'y': float(row['FPS'])}
-                    for i, row in anomalies.iterrows()
-                ]
+            # 异常帧以时间、FPS两个并列数组输出，由页面组装成散点
+            chart_data['fps_anomaly'] = {'x': x[self._anomaly_mask], 'y': cols['FPS'][self._anomaly_mask]}
 
         # 内存数据
-        if 'TotalAllocated_MB' in self.df.columns:
-            chart_data['memory_total'] = self.df['TotalAllocated_MB'].tolist()
-        if 'MonoUsed_MB' in self.df.columns:
-            chart_data['memory_mono'] = self.df['MonoUsed_MB'].tolist()
+        if 'TotalAllocated_MB' in cols:
+            chart_data['memory_total'] = cols['TotalAllocated_MB'][idx]
+        if 'MonoUsed_MB' in cols:
+            chart_data['memory_mono'] = cols['MonoUsed_MB'][idx]
 
         # GC数据
-        if 'GCAllocThisFrame_KB' in self.df.columns:
-            chart_data['gc_alloc'] = self.df['GCAllocThisFrame_KB'].tolist()
+        if 'GCAllocThisFrame_KB' in cols:
+            chart_data['gc_alloc'] = cols['GCAllocThisFrame_KB'][idx]
 
         # CPU/GPU数据
-        if 'CPUFrameTime_ms' in self.df.columns:
-            chart_data['cpu_time'] = self.df['CPUFrameTime_ms'].tolist()
+        if 'CPUFrameTime_ms' in cols:
+            chart_data['cpu_time'] = cols['CPUFrameTime_ms'][idx]
 
         for col in ['GPUFrameTime_ms', 'GPU_ms']:
-            if col in self.df.columns:
-                chart_data['gpu_time'] = self.df[col].tolist()
+            if col in cols:
+                chart_data['gpu_time'] = cols[col][idx]
                 break
 
         # 渲染数据
-        if 'DrawCalls' in self.df.columns:
-            chart_data['draw_calls'] = self.df['DrawCalls'].tolist()
+        if 'DrawCalls' in cols:
+            chart_data['draw_calls'] = cols['DrawCalls'][idx]
 
         return chart_data
 
-    def generate_interactive_html(self, output_file='performance_report.html'):
-        """生成交互式HTML报告"""
-        html_content = self._build_html_template()
-
+    def generate_interactive_html(self, output_file='performance_report.html', data_sidecar=False):
+        """生成交互式HTML报告（data_sidecar 为 True 时图表数据另存为同名 .data.json.gz，由页面 fetch 读取）"""
         output_dir = Path('performance_analysis')
         output_dir.mkdir(exist_ok=True)
 
+        # 依次写入页面头部、分析数据和尾部，峰值内存不再是整页大小的两倍
+        head, tail = _report_template()
         output_path = output_dir / output_file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with open(output_path, 'wb') as f:
+            f.write(self._render_head(head).encode('utf-8'))
+            # 数据放在 <script type="application/json"> 中，转义 </ 以免提前结束标签
+            chart_data = quantize_chart_data(self.results['chart_data'])
+            if data_sidecar:
+                data_path = output_path.with_suffix('.data.json.gz')
+                with gzip.open(data_path, 'wb', compresslevel=6) as data_file:
+                    data_file.write(_dumps(chart_data))
+                data = dict(self.results, chart_data=None, chart_data_file=data_path.name)
+            else:
+                data = dict(self.results, chart_data=chart_data)
+            f.write(_dumps(data).replace(b'</', b'<\\/'))
+            f.write(tail.encode('utf-8'))
 
         print(f"✓ 交互式报告已生成: {output_path}")
+        if data_sidecar:
+            print(f"  图表数据: {data_path}（需通过 HTTP 访问报告目录，例如在该目录运行 python -m http.server）")
 
         # 自动打开浏览器
         webbrowser.open(f'file://{output_path.absolute()}')
@@ -500,974 +1235,51 @@ class InteractivePerformanceAnalyzer:
 
         return str(output_path)
 
-    def _build_html_template(self):
-        """构建HTML模板"""
-        # 转换数据为JSON
-        analysis_json = json.dumps(self.results, indent=2, ensure_ascii=False)
-
-        return f'''<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Unity性能分析报告</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Microsoft YaHei', sans-serif;
-            background: #F5F7FA;
-            color: #2C3E50;
-            line-height: 1.6;
-        }}
-
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 40px;
-            border-radius: 16px;
-            margin-bottom: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        }}
-
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }}
-
-        .header-info {{
-            opacity: 0.95;
-            font-size: 1.1em;
-        }}
-
-        .metrics-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-
-        .metric-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 12px;
-            box-shadow: 0 2px 12px rgba(0,0,0,0.08);
-            transition: transform 0.3s, box-shadow 0.3s;
-        }}
-
-        .metric-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 6px 24px rgba(0,0,0,0.12);
-        }}
-
-        .metric-card.good {{
-            border-left: 4px solid #27AE60;
-        }}
-
-        .metric-card.warning {{
-            border-left: 4px solid #F39C12;
-        }}
-
-        .metric-card.bad {{
-            border-left: 4px solid #E74C3C;
-        }}
-
-        .metric-title {{
-            font-size: 0.9em;
-            color: #7F8C8D;
-            margin-bottom: 8px;
-            font-weight: 500;
-        }}
-
-        .metric-value {{
-            font-size: 2.2em;
-            font-weight: 700;
-            color: #2C3E50;
-            margin-bottom: 4px;
-        }}
-
-        .metric-label {{
-            font-size: 0.85em;
-            color: #95A5A6;
-        }}
-
-        .tabs {{
-            display: flex;
-            gap: 10px;
-            margin-bottom: 30px;
-            border-bottom: 2px solid #E8E8E8;
-            padding-bottom: 0;
-        }}
-
-        .tab {{
-            padding: 12px 24px;
-            background: white;
-            border: none;
-            border-radius: 8px 8px 0 0;
-            cursor: pointer;
-            font-size: 1em;
-            font-weight: 600;
-            color: #7F8C8D;
-            transition: all 0.3s;
-        }}
-
-        .tab:hover {{
-            background: #F8F9FA;
-            color: #2C3E50;
-        }}
-
-        .tab.active {{
-            background: #667eea;
-            color: white;
-        }}
-
-        .tab-content {{
-            display: none;
-        }}
-
-        .tab-content.active {{
-            display: block;
-            animation: fadeIn 0.4s;
-        }}
-
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-
-        .chart-section {{
-            background: white;
-            padding: 30px;
-            border-radius: 12px;
-            margin-bottom: 30px;
-            box-shadow: 0 2px 12px rgba(0,0,0,0.08);
-        }}
-
-        .chart-section h2 {{
-            color: #2C3E50;
-            margin-bottom: 20px;
-            font-size: 1.8em;
-            padding-bottom: 12px;
-            border-bottom: 3px solid #667eea;
-        }}
-
-        .chart-container {{
-            position: relative;
-            height: 400px;
-            margin-top: 20px;
-        }}
-
-        .chart-container.large {{
-            height: 500px;
-        }}
-
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 15px;
-            margin-top: 20px;
-        }}
-
-        .stat-item {{
-            background: #F8F9FA;
-            padding: 15px;
-            border-radius: 8px;
-            text-align: center;
-        }}
-
-        .stat-item-label {{
-            font-size: 0.85em;
-            color: #7F8C8D;
-            margin-bottom: 6px;
-        }}
-
-        .stat-item-value {{
-            font-size: 1.5em;
-            font-weight: 700;
-            color: #2C3E50;
-        }}
-
-        .issue-list {{
-            margin-top: 20px;
-        }}
-
-        .issue-item {{
-            background: white;
-            padding: 20px;
-            margin-bottom: 15px;
-            border-left: 5px solid #667eea;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.06);
-        }}
-
-        .issue-item.critical {{
-            border-left-color: #E74C3C;
-            background: #FFEBEE;
-        }}
-
-        .issue-item.warning {{
-            border-left-color: #F39C12;
-            background: #FFF8E1;
-        }}
-
-        .issue-severity {{
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 0.8em;
-            font-weight: 700;
-            margin-right: 10px;
-        }}
-
-        .issue-severity.critical {{
-            background: #E74C3C;
-            color: white;
-        }}
-
-        .issue-severity.warning {{
-            background: #F39C12;
-            color: white;
-        }}
-
-        .recommendation-card {{
-            background: white;
-            padding: 25px;
-            margin-bottom: 20px;
-            border-radius: 12px;
-            border-left: 5px solid #27AE60;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.06);
-        }}
-
-        .recommendation-card h3 {{
-            color: #27AE60;
-            margin-bottom: 15px;
-        }}
-
-        .recommendation-card ul {{
-            margin-left: 20px;
-        }}
-
-        .recommendation-card li {{
-            margin-bottom: 10px;
-            color: #2C3E50;
-        }}
-
-        .footer {{
-            text-align: center;
-            padding: 30px;
-            color: #7F8C8D;
-            margin-top: 50px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>Unity性能分析报告</h1>
-            <div class="header-info">
-                <span>文件: {self.results['metadata']['file_name']}</span> | 
-                <span>平台: {self.results['metadata']['platform']}</span> | 
-                <span>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</span>
-            </div>
-        </div>
-
-        <div class="metrics-grid" id="metricsGrid"></div>
-
-        <div class="tabs">
-            <button class="tab active" onclick="switchTab('overview')">性能概览</button>
-            <button class="tab" onclick="switchTab('fps')">FPS分析</button>
-            <button class="tab" onclick="switchTab('memory')">内存与GC</button>
-            <button class="tab" onclick="switchTab('rendering')">渲染分析</button>
-            <button class="tab" onclick="switchTab('issues')">问题与建议</button>
-        </div>
-
-        <div id="overview" class="tab-content active">
-            <div class="chart-section">
-                <h2>性能时间线</h2>
-                <div class="chart-container large">
-                    <canvas id="overviewChart"></canvas>
-                </div>
-            </div>
-        </div>
-
-        <div id="fps" class="tab-content">
-            <div class="chart-section">
-                <h2>FPS时间序列</h2>
-                <div class="chart-container large">
-                    <canvas id="fpsTimelineChart"></canvas>
-                </div>
-            </div>
-
-            <div class="chart-section">
-                <h2>FPS分布统计</h2>
-                <div class="chart-container">
-                    <canvas id="fpsDistributionChart"></canvas>
-                </div>
-                <div class="stats-grid">
-                    <div class="stat-item">
-                        <div class="stat-item-label">平均FPS</div>
-                        <div class="stat-item-value">{self.results['fps']['mean']:.1f}</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-item-label">最低FPS</div>
-                        <div class="stat-item-value">{self.results['fps']['min']:.1f}</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-item-label">P1低点</div>
-                        <div class="stat-item-value">{self.results['fps']['p1']:.1f}</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-item-label">P5低点</div>
-                        <div class="stat-item-value">{self.results['fps']['p5']:.1f}</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-item-label">P95高点</div>
-                        <div class="stat-item-value">{self.results['fps']['p95']:.1f}</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-item-label">变异系数</div>
-                        <div class="stat-item-value">{self.results['fps']['cv']:.2f}</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div id="memory" class="tab-content">
-            <div class="chart-section">
-                <h2>内存使用趋势</h2>
-                <div class="chart-container">
-                    <canvas id="memoryChart"></canvas>
-                </div>
-            </div>
-
-            <div class="chart-section">
-                <h2>GC分配</h2>
-                <div class="chart-container">
-                    <canvas id="gcChart"></canvas>
-                </div>
-            </div>
-        </div>
-
-        <div id="rendering" class="tab-content">
-            <div class="chart-section">
-                <h2>CPU/GPU时间</h2>
-                <div class="chart-container">
-                    <canvas id="cpuGpuChart"></canvas>
-                </div>
-            </div>
-
-            <div class="chart-section">
-                <h2>Draw Calls</h2>
-                <div class="chart-container">
-                    <canvas id="drawCallsChart"></canvas>
-                </div>
-            </div>
-        </div>
-
-        <div id="issues" class="tab-content">
-            <div class="chart-section">
-                <h2>检测到的问题</h2>
-                <div class="issue-list" id="issuesList"></div>
-            </div>
-
-            <div class="chart-section">
-                <h2>优化建议</h2>
-                <div id="recommendationsList"></div>
-            </div>
-        </div>
-
-        <div class="footer">
-            <p>Unity Performance Interactive Analyzer v2.0</p>
-            <p>Powered by Chart.js & Python</p>
-        </div>
-    </div>
-
-    <script>
-        // 分析数据
-        const analysisData = {analysis_json};
-
-        // 切换标签
-        function switchTab(tabName) {{
-            document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
-            document.querySelectorAll('.tab-content').forEach(content => content.classList.remove('active'));
-
-            event.target.classList.add('active');
-            document.getElementById(tabName).classList.add('active');
-        }}
-
-        // 渲染指标卡片
-        function renderMetrics() {{
-            const fps = analysisData.fps;
-            const score = analysisData.performance_score;
-            const anomalyRate = analysisData.anomalies.rate * 100;
-
-            const metrics = [
-                {{
-                    title: '性能评分',
-                    value: score.toFixed(0),
-                    label: '/ 100',
-                    status: score >= 80 ? 'good' : score >= 60 ? 'warning' : 'bad'
-                }},
-                {{
-                    title: '平均FPS',
-                    value: fps.mean.toFixed(1),
-                    label: `最低: ${{fps.min.toFixed(1)}}`,
-                    status: fps.mean >= 55 ? 'good' : fps.mean >= 30 ? 'warning' : 'bad'
-                }},
-                {{
-                    title: 'P1低点',
-                    value: fps.p1.toFixed(1),
-                    label: 'FPS',
-                    status: fps.p1 >= 30 ? 'good' : fps.p1 >= 20 ? 'warning' : 'bad'
-                }},
-                {{
-                    title: 'FPS稳定性',
-                    value: (fps.cv * 100).toFixed(1),
-                    label: '%变异系数',
-                    status: fps.cv < 0.15 ? 'good' : fps.cv < 0.25 ? 'warning' : 'bad'
-                }},
-                {{
-                    title: '异常率',
-                    value: anomalyRate.toFixed(1),
-                    label: `% (${{analysisData.anomalies.count}}次)`,
-                    status: anomalyRate < 5 ? 'good' : anomalyRate < 15 ? 'warning' : 'bad'
-                }}
-            ];
-
-            if (analysisData.memory && analysisData.memory.max) {{
-                metrics.push({{
-                    title: '内存峰值',
-                    value: analysisData.memory.max.toFixed(0),
-                    label: 'MB',
-                    status: analysisData.memory.max < 500 ? 'good' : analysisData.memory.max < 800 ? 'warning' : 'bad'
-                }});
-            }}
-
-            const grid = document.getElementById('metricsGrid');
-            grid.innerHTML = metrics.map(m => `
-                <div class="metric-card ${{m.status}}">
-                    <div class="metric-title">${{m.title}}</div>
-                    <div class="metric-value">${{m.value}}</div>
-                    <div class="metric-label">${{m.label}}</div>
-                </div>
-            `).join('');
-        }}
-
-        // 渲染问题列表
-        function renderIssues() {{
-            const issuesList = document.getElementById('issuesList');
-            const issues = analysisData.issues || [];
-
-            if (issues.length === 0) {{
-                issuesList.innerHTML = '<p style="color: #27AE60; font-size: 1.2em;">✓ 未检测到性能问题</p>';
-                return;
-            }}
-
-            issuesList.innerHTML = issues.map(issue => `
-                <div class="issue-item ${{issue.severity}}">
-                    <span class="issue-severity ${{issue.severity}}">${{issue.severity.toUpperCase()}}</span>
-                    <strong>${{issue.category}}</strong>: ${{issue.description}}
-                    <p style="margin-top: 10px; color: #7F8C8D;"><strong>建议:</strong> ${{issue.suggestion}}</p>
-                </div>
-            `).join('');
-        }}
-
-        // 渲染建议列表
-        function renderRecommendations() {{
-            const recList = document.getElementById('recommendationsList');
-            const recommendations = analysisData.recommendations || [];
-
-            if (recommendations.length === 0) {{
-                recList.innerHTML = '<p style="color: #7F8C8D;">暂无优化建议</p>';
-                return;
-            }}
-
-            recList.innerHTML = recommendations.map(rec => `
-                <div class="recommendation-card">
-                    <h3>${{rec.category}} [优先级: ${{rec.priority.toUpperCase()}}]</h3>
-                    <ul>
-                        ${{rec.suggestions.map(s => `<li>${{s}}</li>`).join('')}}
-                    </ul>
-                </div>
-            `).join('');
-        }}
-
-        // 创建FPS时间线图表
-        function createFPSTimeline() {{
-            const ctx = document.getElementById('fpsTimelineChart');
-            if (!ctx) return;
-
-            const chartData = analysisData.chart_data;
-
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.timestamps,
-                    datasets: [
-                        {{
-                            label: 'FPS',
-                            data: chartData.fps,
-                            borderColor: '#3498DB',
-                            backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                            borderWidth: 2,
-                            fill: true,
-                            tension: 0.4
-                        }},
-                        {{
-                            label: '异常帧',
-                            data: chartData.fps_anomaly || [],
-                            type: 'scatter',
-                            backgroundColor: '#E74C3C',
-                            pointRadius: 8,
-                            pointStyle: 'cross'
-                        }}
-                    ]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    interaction: {{
-                        mode: 'index',
-                        intersect: false
-                    }},
-                    plugins: {{
-                        annotation: {{
-                            annotations: {{
-                                line1: {{
-                                    type: 'line',
-                                    yMin: 60,
-                                    yMax: 60,
-                                    borderColor: '#27AE60',
-                                    borderWidth: 2,
-                                    borderDash: [10, 5],
-                                    label: {{
-                                        content: '60 FPS',
-                                        enabled: true,
-                                        position: 'end'
-                                    }}
-                                }},
-                                line2: {{
-                                    type: 'line',
-                                    yMin: 30,
-                                    yMax: 30,
-                                    borderColor: '#F39C12',
-                                    borderWidth: 2,
-                                    borderDash: [10, 5],
-                                    label: {{
-                                        content: '30 FPS',
-                                        enabled: true,
-                                        position: 'end'
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }},
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (秒)'
-                            }}
-                        }},
-                        y: {{
-                            title: {{
-                                display: true,
-                                text: 'FPS'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 创建FPS分布图
-        function createFPSDistribution() {{
-            const ctx = document.getElementById('fpsDistributionChart');
-            if (!ctx) return;
-
-            const fps = analysisData.chart_data.fps;
-            const binCount = 30;
-            const min = Math.min(...fps);
-            const max = Math.max(...fps);
-            const binSize = (max - min) / binCount;
-
-            const bins = new Array(binCount).fill(0);
-            fps.forEach(value => {{
-                const binIndex = Math.min(Math.floor((value - min) / binSize), binCount - 1);
-                bins[binIndex]++;
-            }});
-
-            const labels = Array.from({{length: binCount}}, (_, i) => 
-                (min + i * binSize).toFixed(0) + '-' + (min + (i + 1) * binSize).toFixed(0)
-            );
-
-            new Chart(ctx, {{
-                type: 'bar',
-                data: {{
-                    labels: labels,
-                    datasets: [{{
-                        label: '频次',
-                        data: bins,
-                        backgroundColor: '#9B59B6',
-                        borderColor: '#8E44AD',
-                        borderWidth: 1
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: 'FPS区间'
-                            }}
-                        }},
-                        y: {{
-                            title: {{
-                                display: true,
-                                text: '频次'
-                            }},
-                            beginAtZero: true
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 创建内存图表
-        function createMemoryChart() {{
-            const ctx = document.getElementById('memoryChart');
-            if (!ctx) return;
-
-            const chartData = analysisData.chart_data;
-            const datasets = [];
-
-            if (chartData.memory_total) {{
-                datasets.push({{
-                    label: '总内存',
-                    data: chartData.memory_total,
-                    borderColor: '#E74C3C',
-                    backgroundColor: 'rgba(231, 76, 60, 0.1)',
-                    borderWidth: 2.5,
-                    fill: true,
-                    tension: 0.4
-                }});
-            }}
-
-            if (chartData.memory_mono) {{
-                datasets.push({{
-                    label: 'Mono内存',
-                    data: chartData.memory_mono,
-                    borderColor: '#3498DB',
-                    backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                    borderWidth: 2,
-                    fill: true,
-                    tension: 0.4
-                }});
-            }}
-
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.timestamps,
-                    datasets: datasets
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (秒)'
-                            }}
-                        }},
-                        y: {{
-                            title: {{
-                                display: true,
-                                text: '内存 (MB)'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 创建GC图表
-        function createGCChart() {{
-            const ctx = document.getElementById('gcChart');
-            if (!ctx) return;
-
-            const chartData = analysisData.chart_data;
-
-            if (!chartData.gc_alloc) {{
-                ctx.parentElement.innerHTML = '<p style="color: #7F8C8D;">无GC数据</p>';
-                return;
-            }}
-
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.timestamps,
-                    datasets: [{{
-                        label: 'GC分配',
-                        data: chartData.gc_alloc,
-                        borderColor: '#F39C12',
-                        backgroundColor: 'rgba(243, 156, 18, 0.2)',
-                        borderWidth: 2,
-                        fill: true,
-                        tension: 0.4
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (秒)'
-                            }}
-                        }},
-                        y: {{
-                            title: {{
-                                display: true,
-                                text: 'GC分配 (KB)'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 创建CPU/GPU图表
-        function createCPUGPUChart() {{
-            const ctx = document.getElementById('cpuGpuChart');
-            if (!ctx) return;
-
-            const chartData = analysisData.chart_data;
-            const datasets = [];
-
-            if (chartData.cpu_time) {{
-                datasets.push({{
-                    label: 'CPU时间',
-                    data: chartData.cpu_time,
-                    borderColor: '#E74C3C',
-                    borderWidth: 2,
-                    fill: false,
-                    tension: 0.4
-                }});
-            }}
-
-            if (chartData.gpu_time) {{
-                datasets.push({{
-                    label: 'GPU时间',
-                    data: chartData.gpu_time,
-                    borderColor: '#9B59B6',
-                    borderWidth: 2,
-                    fill: false,
-                    tension: 0.4
-                }});
-            }}
-
-            if (datasets.length === 0) {{
-                ctx.parentElement.innerHTML = '<p style="color: #7F8C8D;">无CPU/GPU数据</p>';
-                return;
-            }}
-
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.timestamps,
-                    datasets: datasets
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (秒)'
-                            }}
-                        }},
-                        y: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (ms)'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 创建DrawCalls图表
-        function createDrawCallsChart() {{
-            const ctx = document.getElementById('drawCallsChart');
-            if (!ctx) return;
-
-            const chartData = analysisData.chart_data;
-
-            if (!chartData.draw_calls) {{
-                ctx.parentElement.innerHTML = '<p style="color: #7F8C8D;">无渲染数据</p>';
-                return;
-            }}
-
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.timestamps,
-                    datasets: [{{
-                        label: 'Draw Calls',
-                        data: chartData.draw_calls,
-                        borderColor: '#16A085',
-                        backgroundColor: 'rgba(22, 160, 133, 0.1)',
-                        borderWidth: 2,
-                        fill: true,
-                        tension: 0.4
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (秒)'
-                            }}
-                        }},
-                        y: {{
-                            title: {{
-                                display: true,
-                                text: 'Draw Calls'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 创建概览图表
-        function createOverviewChart() {{
-            const ctx = document.getElementById('overviewChart');
-            if (!ctx) return;
-
-            const chartData = analysisData.chart_data;
-
-            new Chart(ctx, {{
-                type: 'line',
-                data: {{
-                    labels: chartData.timestamps,
-                    datasets: [
-                        {{
-                            label: 'FPS',
-                            data: chartData.fps,
-                            borderColor: '#3498DB',
-                            backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                            yAxisID: 'y',
-                            borderWidth: 2.5,
-                            fill: true,
-                            tension: 0.4
-                        }},
-                        {{
-                            label: '总内存 (MB)',
-                            data: chartData.memory_total || [],
-                            borderColor: '#E74C3C',
-                            yAxisID: 'y1',
-                            borderWidth: 2,
-                            fill: false,
-                            tension: 0.4
-                        }}
-                    ]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    interaction: {{
-                        mode: 'index',
-                        intersect: false
-                    }},
-                    scales: {{
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: '时间 (秒)'
-                            }}
-                        }},
-                        y: {{
-                            type: 'linear',
-                            display: true,
-                            position: 'left',
-                            title: {{
-                                display: true,
-                                text: 'FPS'
-                            }}
-                        }},
-                        y1: {{
-                            type: 'linear',
-                            display: true,
-                            position: 'right',
-                            title: {{
-                                display: true,
-                                text: '内存 (MB)'
-                            }},
-                            grid: {{
-                                drawOnChartArea: false
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
-
-        // 初始化
-        document.addEventListener('DOMContentLoaded', function() {{
-            renderMetrics();
-            renderIssues();
-            renderRecommendations();
-
-            createOverviewChart();
-            createFPSTimeline();
-            createFPSDistribution();
-            createMemoryChart();
-            createGCChart();
-            createCPUGPUChart();
-            createDrawCallsChart();
-        }});
-    </script>
-</body>
-</html>'''
+    def _metrics_html(self):
+        """顶部指标卡片的静态HTML（页面加载后不再变化，无需由脚本生成）"""
+        return ''.join(
+            f'<div class="metric-card {card["status"]}">'
+            f'<div class="metric-title">{html.escape(card["title"])}</div>'
+            f'<div class="metric-value">{html.escape(card["value"])}</div>'
+            f'<div class="metric-label">{html.escape(card["label"])}</div>'
+            f'</div>'
+            for card in self.results['metric_cards']
+        )
+
+    def _render_head(self, head):
+        """填充HTML模板头部（分析数据之前的部分）中的 __NAME__ 占位符"""
+        fps = self.results['fps']
+        values = {
+            'FILE_NAME': html.escape(self.results['metadata']['file_name']),
+            'PLATFORM': html.escape(self.results['metadata']['platform']),
+            'TIMESTAMP': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'FPS_MEAN': f"{fps['mean']:.1f}",
+            'FPS_MIN': f"{fps['min']:.1f}",
+            'FPS_P1': f"{fps['p1']:.1f}",
+            'FPS_P5': f"{fps['p5']:.1f}",
+            'FPS_P95': f"{fps['p95']:.1f}",
+            'FPS_CV': f"{fps['cv']:.2f}",
+            'METRICS_HTML': self._metrics_html()
+        }
+        return re.sub(r'__([A-Z0-9_]+)__', lambda m: values[m.group(1)], head)
 
 
 def main():
-    import sys
+    # --data-sidecar：图表数据写入单独的 .json.gz 文件，适合放到 HTTP 服务器上查看的大型报告
+    args = [arg for arg in sys.argv[1:] if arg != '--data-sidecar']
+    data_sidecar = len(args) < len(sys.argv) - 1
 
-    if len(sys.argv) < 2:
-        print("使用方法: python unity_performance_analyzer_interactive.py <csv_file> [platform]")
+    if len(args) < 1:
+        print("使用方法: python unity_performance_analyzer_interactive.py <csv_file> [platform] [--data-sidecar]")
         print("示例: python unity_performance_analyzer_interactive.py report.csv Android")
         return
 
-    csv_file = sys.argv[1]
-    platform = sys.argv[2] if len(sys.argv) > 2 else 'PC'
+    csv_file = args[0]
+    platform = args[1] if len(args) > 1 else 'PC'
 
     analyzer = InteractivePerformanceAnalyzer(csv_file, platform)
-    analyzer.load_data()
-    analyzer.analyze()
-    analyzer.generate_interactive_html()
+    analyzer.run_analysis()
+    analyzer.generate_interactive_html(data_sidecar=data_sidecar)
 
     print("\n✓ 分析完成！交互式报告已在浏览器中打开")
 